@@ -0,0 +1,52 @@
+"""Compare the json and Arrow IPC responses of Aggrid for a large DataFrame.
+
+Measures the time to build each response and the size of its body, also after gzip.
+
+Run from the repository root:
+
+    PYTHONPATH=src python benchmarks/aggrid_benchmark.py --rows 100000 --columns 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import time
+
+import polars as pl
+
+from uiwiz.elements.aggrid.aggrid import Aggrid
+
+
+def make_frame(rows: int, columns: int) -> pl.DataFrame:
+    index = pl.int_range(rows)
+    kinds = (index, index / 7, pl.format("name {}", index))
+    return pl.select(kinds[column % 3].alias(f"col_{column}") for column in range(columns))
+
+
+def bench(build, df: pl.DataFrame, repeat: int) -> tuple[float, bytes]:  # noqa: ANN001
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = build(df).body
+        best = min(best, time.perf_counter() - start)
+    return best, body
+
+
+def main(rows: int, columns: int, repeat: int) -> None:
+    df = make_frame(rows, columns)
+    print(f"{rows} rows x {columns} columns")
+    print(f"{'transport':<10}{'serialize':>14}{'size':>12}{'gzip':>12}")
+    for name, build in {"json": Aggrid.response, "arrow": Aggrid.arrow_response}.items():
+        elapsed, body = bench(build, df, repeat)
+        compressed = len(gzip.compress(body, compresslevel=6))
+        print(f"{name:<10}{elapsed * 1000:>11.1f} ms{len(body) / 1e6:>9.2f} MB{compressed / 1e6:>9.2f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--columns", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(args.rows, args.columns, args.repeat)
@@ -0,0 +1,42 @@
+"""Measure the memory used per element with tracemalloc.
+
+Run from the repository root:
+
+    PYTHONPATH=src python benchmarks/memory_benchmark.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import tracemalloc
+
+from render_benchmark import build_tree
+from starlette.requests import Request
+
+from uiwiz import UiwizApp
+from uiwiz.frame import Frame
+from uiwiz.middleware.asgi_request_middleware import _request_ctx_var
+
+
+def bench(rows: int) -> None:
+    _request_ctx_var.set(Request({"type": "http", "headers": [], "app": UiwizApp()}))
+    frame = Frame.get_stack()
+    build_tree(1)  # warm up caches outside of the measurement
+    Frame.del_stack()
+
+    frame = Frame.get_stack()
+    tracemalloc.start()
+    build_tree(rows)
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    nodes = frame.id_count
+    print(f"{nodes} nodes use {size / 1024:,.0f} KiB (peak {peak / 1024:,.0f} KiB), {size / nodes:,.0f} bytes/node")
+    Frame.del_stack()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5000, help="rows of 10 elements each")
+    args = parser.parse_args()
+    bench(args.rows)
@@ -0,0 +1,90 @@
+"""Measure the per-request cost of the UiwizApp middleware stack.
+
+Requests are sent straight to the ASGI app, without a server, for a static file and for a
+rendered page. ``middleware only`` runs the same middleware around an app that returns an
+empty response, which isolates the overhead of the middleware from the endpoints.
+
+Run from the repository root:
+
+    PYTHONPATH=src python benchmarks/middleware_benchmark.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import time
+
+from uiwiz import UiwizApp, ui
+from uiwiz.version import __version__
+
+
+async def empty_app(scope, receive, send) -> None:  # noqa: ANN001, ARG001
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/html")]})
+    await send({"type": "http.response.body", "body": b""})
+
+
+def middleware_only(app: UiwizApp):  # noqa: ANN201
+    inner = empty_app
+    for cls, args, kwargs in reversed(app.user_middleware):
+        inner = cls(inner, *args, **kwargs)
+    return inner
+
+
+def make_scope(path: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"localhost"), (b"accept-encoding", b"gzip, deflate")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 8080),
+    }
+
+
+async def receive() -> dict:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message: dict) -> None: ...
+
+
+async def bench(app, path: str, requests: int) -> float:  # noqa: ANN001
+    for _ in range(min(requests, 100)):
+        await app(make_scope(path), receive, send)
+    gc.collect()
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(make_scope(path), receive, send)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+async def main(requests: int) -> None:
+    app = UiwizApp()
+
+    @app.page("/page")
+    def page() -> None:
+        with ui.element():
+            ui.label("Hello world")
+
+    paths = {"static": f"/_static/{__version__}/app.css", "dynamic": "/page"}
+    stack = middleware_only(app)
+    print(f"{'route':<10}{'full app':>14}{'middleware only':>20}")
+    for name, path in paths.items():
+        full = await bench(app, path, requests)
+        overhead = await bench(stack, path, requests)
+        print(f"{name:<10}{full:>11.1f} us{overhead:>17.1f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,60 @@
+"""Measure how many elements per second the renderer serializes.
+
+Run from the repository root:
+
+    PYTHONPATH=src python benchmarks/render_benchmark.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+
+from starlette.requests import Request
+
+from uiwiz import UiwizApp, ui
+from uiwiz.frame import Frame
+from uiwiz.middleware.asgi_request_middleware import _request_ctx_var
+
+
+def build_tree(rows: int) -> ui.element:
+    """Build a table like tree with 10 elements per row."""
+    with ui.element("table") as root:
+        for row in range(rows):
+            with ui.element("tr").classes("hover"):
+                for col in range(3):
+                    ui.element("td", content=f"{row}-{col}").classes("px-2")
+                with ui.element("td"):
+                    ui.button("Edit").classes("btn-sm")
+                    ui.input(name=f"input-{row}", value="value")
+                    ui.label("label")
+                    ui.element("span", content="<escaped>")
+                ui.element("td")
+    return root
+
+
+def bench(rows: int, repeat: int) -> None:
+    _request_ctx_var.set(Request({"type": "http", "headers": [], "app": UiwizApp()}))
+    best = float("inf")
+    nodes = 0
+    for _ in range(repeat):
+        Frame.get_stack()
+        root = build_tree(rows)
+        nodes = Frame.get_stack().id_count
+        gc.collect()
+        gc.disable()
+        start = time.perf_counter()
+        root.render()
+        best = min(best, time.perf_counter() - start)
+        gc.enable()
+        Frame.del_stack()
+    print(f"{nodes} nodes rendered in {best * 1000:.1f} ms, {nodes / best:,.0f} nodes/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000, help="rows of 10 elements each")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    bench(args.rows, args.repeat)
@@ -0,0 +1,41 @@
+"""Measure route lookups for closures created on every request.
+
+Elements like ``ui.label().bind_text_from`` create a new handler closure each time
+a page is rendered, and every closure is looked up with ``fetch_route``.
+
+Run from the repository root:
+
+    PYTHONPATH=src python benchmarks/route_hash_benchmark.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from uiwiz.shared import fetch_route
+
+
+def make_handler(element_id: str):
+    async def bind_value() -> None: ...
+
+    bind_value.__name__ = f"{bind_value.__name__}_{element_id}"
+    return bind_value
+
+
+def bench(pages: int, closures: int) -> None:
+    start = time.perf_counter()
+    for page in range(pages):
+        for i in range(closures):
+            fetch_route(make_handler(f"a{page}-{i}"))
+    elapsed = time.perf_counter() - start
+    lookups = pages * closures
+    print(f"{lookups} lookups in {elapsed * 1000:.1f} ms, {elapsed / lookups * 1e6:.2f} us/lookup")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--closures", type=int, default=100, help="closures per page")
+    args = parser.parse_args()
+    bench(args.pages, args.closures)
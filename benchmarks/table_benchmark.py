@@ -0,0 +1,66 @@
+"""Compare rendering a polars DataFrame with Table.from_dataframe to an element per cell.
+
+Run from the repository root:
+
+    PYTHONPATH=src python benchmarks/table_benchmark.py --rows 100000 --columns 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from unittest import mock
+
+import polars as pl
+
+from uiwiz.element import Element
+from uiwiz.elements.table import Table
+from uiwiz.frame import Frame
+
+
+def element_per_cell(df: pl.DataFrame) -> Element:
+    """The previous implementation of Table.from_dataframe."""
+    df = df.fill_null("None")
+    with Element().classes(Table._classes_container) as container:
+        with Element("table").classes(Table._classes_table):
+            with Element("thead"), Element("tr"):
+                for col in df.columns:
+                    Element("th", content=col)
+            with Element("tbody"):
+                for row in df.iter_rows():
+                    with Element("tr"):
+                        for val in row:
+                            Element("td", content=val)
+    return container
+
+
+def make_frame(rows: int, columns: int) -> pl.DataFrame:
+    index = pl.int_range(rows)
+    kinds = (index, index / 7, pl.format("name <{}> & co", index))
+    return pl.select(kinds[column % 3].alias(f"col_{column}") for column in range(columns))
+
+
+def bench(render, df: pl.DataFrame) -> tuple[float, int]:  # noqa: ANN001
+    Frame.get_stack()
+    start = time.perf_counter()
+    html = render(df).render()
+    elapsed = time.perf_counter() - start
+    Frame.get_stack().del_stack()
+    return elapsed, len(html)
+
+
+def main(rows: int, columns: int) -> None:
+    df = make_frame(rows, columns)
+    print(f"{rows} rows x {columns} columns")
+    with mock.patch("uiwiz.frame.get_request"):
+        for name, render in {"from_dataframe": Table.from_dataframe, "element per cell": element_per_cell}.items():
+            elapsed, size = bench(render, df)
+            print(f"{name:<18}{elapsed * 1000:>10.1f} ms{size / 1e6:>10.1f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--columns", type=int, default=10)
+    args = parser.parse_args()
+    main(args.rows, args.columns)
@@ -1,3 +1,5 @@
+import asyncio
+import time
 from random import randint
 
 from uiwiz import server
@@ -33,6 +35,16 @@ async def update_chart():
     )
 
 
+@app.get("/live/stream")
+async def live_stream():
+    async def updates():
+        while True:
+            yield {"Requests": [[time.time() * 1000, randint(0, 100)]]}
+            await asyncio.sleep(1)
+
+    return ui.echart.stream(updates(), window=120)
+
+
 @app.page("/")
 async def test():
     create_nav()
@@ -61,6 +73,16 @@ This is an example of EChart component.
             }
         )
 
+        ui.markdown("## Live Chart")
+        ui.echart(
+            {
+                "xAxis": {"type": "time"},
+                "yAxis": {"type": "value"},
+                "series": [{"name": "Requests", "type": "line", "showSymbol": False, "data": []}],
+            },
+            stream="/live/stream",
+        )
+
         ui.markdown("## Sankey Chart")
         ui.echart(
             {
@@ -1,17 +1,12 @@
 from __future__ import annotations
 
-import json
 import logging
-from mimetypes import guess_type
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from fastapi import FastAPI, Response
-from fastapi.encoders import jsonable_encoder
+from fastapi import FastAPI, Request, Response
 from fastapi.exceptions import RequestValidationError
-from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import HTMLResponse
-from fastapi.staticfiles import StaticFiles
 
 from uiwiz.element import Element
 from uiwiz.elements.button import Button
@@ -19,14 +14,19 @@ from uiwiz.elements.col import Col
 from uiwiz.elements.html import Html
 from uiwiz.frame import Frame
 from uiwiz.middleware.asgi_request_middleware import AsgiRequestMiddleware
-from uiwiz.middleware.static_middleware import AsgiTtlMiddleware
+from uiwiz.middleware.gzip_middleware import PathExcludedGZipMiddleware
+from uiwiz.middleware.static_middleware import AsgiTtlMiddleware, CachePolicies
 from uiwiz.page_route import PageDefinition, PageRouter
-from uiwiz.shared import register_path, resources
+from uiwiz.precompress import PrecompressedStaticFiles, is_compressible, select_encoding
+from uiwiz.serialization import dumps_attribute
+from uiwiz.shared import etag_matches, get_resource, register_path
+from uiwiz.sse import HEARTBEAT_INTERVAL, MAX_EVENT_SIZE
 from uiwiz.version import __version__
 
 if TYPE_CHECKING:
     from fastapi.routing import APIRoute
-    from starlette.requests import Request
+
+    from uiwiz.response_cache import ResponseCache
 
 logger = logging.getLogger("uiwiz")
 logger.addHandler(logging.NullHandler())
@@ -58,7 +58,8 @@ class UiwizApp(FastAPI):
 
         :param toast_delay: The time in milliseconds before the toast is removed
         :param error_classes: The classes to apply to the toast error for default validation errors
-        :param cache_age: The time in seconds to cache the static files
+        :param cache_age: The time in seconds to cache the static files added with add_static_files.
+            The versioned uiwiz static files are cached as immutable
         :param theme: The default theme to use
         :param title: The default title for the app
         :param auto_close_toast_error: If the toast error should auto close
@@ -74,11 +75,16 @@ class UiwizApp(FastAPI):
         self.page_definition_class = page_definition_class
         self.theme = theme
         self.title = title
+        # Static routes serve precompressed files and are skipped by the gzip middleware
+        self.static_prefixes: list[str] = ["/_static/extension/"]
+        self.cache_age = cache_age
+        # Cache-Control values for the static routes, keyed by path prefix
+        self.cache_policies = CachePolicies({f"/_static/{__version__}/": "public, max-age=31536000, immutable"})
         self.add_static_files(f"/_static/{__version__}/", Path(__file__).parent / "static")
 
         self.add_middleware(AsgiRequestMiddleware)
-        self.add_middleware(GZipMiddleware)
-        self.add_middleware(AsgiTtlMiddleware, cache_age=cache_age)
+        self.add_middleware(PathExcludedGZipMiddleware, exclude_prefixes=self.static_prefixes)
+        self.add_middleware(AsgiTtlMiddleware, cache_age=cache_age, policies=self.cache_policies)
         # self.add_middleware(StripHiddenFormFieldMiddleware)
         self.extensions: dict[str, Path] = {}
         self.app_paths: dict[str, Path] = {}
@@ -86,20 +92,30 @@ class UiwizApp(FastAPI):
         self.exception_handler(RequestValidationError)(self.handle_validation_error)
 
         @self.get("/_static/extension/{__version__}/{extension}/{filename}", include_in_schema=False)
-        def get_extension(extension: str, filename: str) -> Response:
-            resource_key = f"{extension}/{filename}"
-            if resource_key not in resources:
+        def get_extension(extension: str, filename: str, request: Request) -> Response:
+            resource = get_resource(f"{extension}/{filename}")
+            if resource is None:
                 return Response(status_code=404)
 
-            with open(resources[resource_key], encoding="utf-8") as f:
-                content = f.read()
-
-            content_type, _ = guess_type(resource_key)
-            return Response(content, media_type=content_type)
+            # The url contains the version, so the content never changes for a given url
+            headers = {"Cache-Control": "public, max-age=31536000, immutable"}
+            content, etag = resource.content, resource.etag
+            if is_compressible(filename, len(content)):
+                headers["Vary"] = "Accept-Encoding"
+                encoding = select_encoding(request.headers.get("accept-encoding"))
+                if encoding is not None:
+                    headers["Content-Encoding"] = encoding
+                    content, etag = resource.encode(encoding), f'{etag[:-1]}-{encoding}"'
+            headers["ETag"] = etag
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                return Response(status_code=304, headers=headers)
+            return Response(content, media_type=resource.media_type, headers=headers)
 
     def add_static_files(self, url_path: str, local_directory: str | Path) -> None:
         """Add local folder as static files and make them public from UiWizard."""
-        self.mount(url_path, StaticFiles(directory=str(local_directory)))
+        self.static_prefixes.append(url_path)
+        self.cache_policies.setdefault(url_path, f"max-age={self.cache_age}")
+        self.mount(url_path, PrecompressedStaticFiles(directory=str(local_directory)))
 
     def page(
         self,
@@ -107,6 +123,9 @@ class UiwizApp(FastAPI):
         *args,  # noqa: ANN002
         title: str | None = None,
         favicon: str | None = None,
+        stream: bool = False,
+        cache: ResponseCache | None = None,
+        etag: bool = False,
         **kwargs,  # noqa: ANN003
     ) -> PageRouter:
         return PageRouter(page_definition_class=self.page_definition_class).page(
@@ -115,12 +134,31 @@ class UiwizApp(FastAPI):
             title=title,
             favicon=favicon,
             router=self.router,
+            stream=stream,
+            cache=cache,
+            etag=etag,
             **kwargs,
         )
 
     def ui(self, path: str, *args, include_js: bool = True, include_css: bool = True, **kwargs) -> PageRouter:
         return PageRouter().ui(path=path, include_js=include_js, include_css=include_css, router=self.router, **kwargs)
 
+    def stream(
+        self,
+        path: str,
+        *args,  # noqa: ANN002
+        heartbeat: float | None = HEARTBEAT_INTERVAL,
+        max_event_size: int = MAX_EVENT_SIZE,
+        **kwargs,  # noqa: ANN003
+    ) -> PageRouter:
+        return PageRouter().stream(
+            path,
+            router=self.router,
+            heartbeat=heartbeat,
+            max_event_size=max_event_size,
+            **kwargs,
+        )
+
     async def handle_validation_error(self, request: Request, exc: RequestValidationError) -> Response:
         fields_with_errors = [item.get("loc")[1] for item in exc.errors()]
         ok_fields = [item for item in exc.body if item not in fields_with_errors]
@@ -131,18 +169,15 @@ class UiwizApp(FastAPI):
         with Element().classes(self.error_classes) as toast:
             toast.attributes["id"] = "toast"
             toast.attributes["hx-swap-oob"] = "afterbegin"
-            toast.attributes["hx-toast-data"] = json.dumps(
-                jsonable_encoder(
-                    {
-                        "detail": exc.errors(),
-                        "fieldErrors": fields_with_errors,
-                        "fieldOk": ok_fields,
-                    },
-                ),
-            )
+            toast_data = {"detail": exc.errors(), "fieldErrors": fields_with_errors, "fieldOk": ok_fields}
+            toast.attributes.__setitem__("hx-toast-data", dumps_attribute(toast_data), False)
             html = Html("").classes("alert alert-error relative")
             html.tag = "span"
-            html.attributes["hx-toast-data"] = json.dumps({"autoClose": self.auto_close_toast_error})
+            html.attributes.__setitem__(
+                "hx-toast-data",
+                dumps_attribute({"autoClose": self.auto_close_toast_error}),
+                False,
+            )
             html.attributes["hx-toast-delete-button"] = lambda: btn.id
             with html:
                 with Col(gap="").classes("relative"):
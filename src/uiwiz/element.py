@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import html
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any
 
 from typing_extensions import Self
@@ -16,6 +17,54 @@ if TYPE_CHECKING:
     from uiwiz.event import FUNC_TYPE, TARGET_TYPE, Event
 
 
+FLUSH = object()
+"""Marker yielded by :meth:`Element.render_iter` where buffered output should be sent to the client."""
+
+
+_VOID_ELEMENTS = frozenset(VOID_ELEMENTS)
+
+
+@lru_cache(maxsize=4096)
+def _render_plan(tag: str, keys: tuple[str, ...]) -> tuple[str, str]:
+    """Compile the static skeleton of an element shape.
+
+    Elements with the same tag and attribute names render the same markup apart from
+    the attribute values. The opening tag is compiled once into a ``str.format``
+    template that only needs the values spliced in.
+
+    :return: The opening tag template and the closing tag.
+    """
+    attrs = " ".join(f'{key}="{{}}"' for key in keys)
+    open_tag = f"<{tag} {attrs}>".replace("{", "{{").replace("}", "}}").replace('"{{}}"', '"{}"')
+    close_tag = "" if tag in _VOID_ELEMENTS else f"</{tag}>"
+    return open_tag, close_tag
+
+
+class Markup:
+    """Pre-rendered html placed in the element tree like an element.
+
+    Used for markup that is rendered once and shared, e.g. the static parts of the page shell.
+    """
+
+    __slots__ = ("html",)
+    oob = False
+
+    def __init__(self, html: str) -> None:
+        self.html = html
+
+    def render(self, render_script: bool = True) -> str:  # noqa: ARG002
+        return self.html
+
+    def __render_self__(self) -> str:
+        return self.html
+
+    def __render_iter__(self) -> Iterator[str]:
+        yield self.html
+
+    def __set_frame__(self, frame: Frame) -> None:
+        pass
+
+
 class _Attributes(dict):
     def __setitem__(self, key: Any, value: Any, escape: bool = True) -> None:
         if escape:
@@ -27,6 +76,25 @@ class _Attributes(dict):
 
 
 class Element:
+    # Attributes live in slots to keep large trees compact. The __dict__ slot is only
+    # allocated when an attribute outside of the slots is assigned, e.g. by a subclass.
+    __slots__ = (
+        "__content__",
+        "__dict__",
+        "_children",
+        "_event",
+        "_size",
+        "attributes",
+        "external_tree_element",
+        "oob",
+        "parent_element",
+        "render_html",
+        "script",
+        "stack",
+        "tag",
+        "target",
+    )
+
     def __init__(
         self,
         tag: ELEMENT_TYPES = "div",
@@ -82,10 +150,10 @@ class Element:
         self.tag: str = tag
         self._size: str = "md"
 
-        self.event: Event = {}
+        self._event: Event | None = None
         self.parent_element: Element | None = self.stack.current_element
         self.external_tree_element: Element | None = None
-        self.children: list[Element] = []
+        self._children: list[Element] | None = None
         self.script: str | None = None
         self.render_html: bool = render_html
         self.target: str | None = None
@@ -127,6 +195,26 @@ class Element:
             for extension in extensions:
                 register_resource(f"{cls.__name__}/{extension.name}", extension)
 
+    @property
+    def event(self) -> Event:
+        if self._event is None:
+            self._event = {}
+        return self._event
+
+    @event.setter
+    def event(self, event: Event) -> None:
+        self._event = event
+
+    @property
+    def children(self) -> list[Element]:
+        if self._children is None:
+            self._children = []
+        return self._children
+
+    @children.setter
+    def children(self, children: list[Element]) -> None:
+        self._children = children
+
     @property
     def id(self) -> str:
         """Get the id of the element."""
@@ -154,7 +242,7 @@ class Element:
 
     @property
     def is_void_element(self) -> bool:
-        return self.tag in VOID_ELEMENTS
+        return self.tag in _VOID_ELEMENTS
 
     def get_classes(self) -> str:
         """Get html classes of the element.
@@ -215,36 +303,76 @@ class Element:
         """
         lst = []
         lst.append(self.__render_self__())
+        if render_script:
+            lst.extend(self.__render_script__(script) for script in self.stack.scripts)
+        return "".join(lst)
+
+    def render_iter(self, render_script: bool = True) -> Iterator[str | object]:
+        """Render the element as a stream of HTML chunks.
+
+        Produces the same markup as :meth:`render`, but walks the tree lazily so
+        the output can be written to the client while the rest of the tree is
+        still being serialized. A :data:`FLUSH` marker is yielded after the
+        closing ``</head>`` tag.
+
+        :param render_script: If any element has a javascript script, it will be rendered as well.
+        :type render_script: bool.
+        """
+        yield from self.__render_iter__()
         if render_script:
             for script in self.stack.scripts:
-                lst.append(  # noqa: PERF401
-                    f"""
+                yield self.__render_script__(script)
+
+    @staticmethod
+    def __render_script__(script: str) -> str:
+        return f"""
                     <script>
                     (function() {{
                     {script}
                     }}());
                     </script>
-                    """,
-                )
-        return "".join(lst)
+                    """
+
+    def __render_iter__(self) -> Iterator[str | object]:
+        if type(self).after_render is not Element.after_render:
+            # after_render needs the complete html of the element
+            yield self.__render_self__()
+            return
 
-    def __render_self__(self) -> str:
         self.before_render()
         if self.script:
             self.stack.scripts.append(self.script)
-        lst = []
-        if self.render_html:
-            self.__add_event_to_attributes__()
+        if not self.render_html:
+            return
+
+        self.__add_event_to_attributes__()
+        open_tag, close_tag = _render_plan(self.tag, tuple(self.attributes))
+        yield open_tag.format(*self.__attribute_values__())
+        yield self.content
+        for child in self._children or ():
+            if child.oob is False:
+                yield from child.__render_iter__()
 
-            lst.append(f"<{self.tag} {self.__dict_to_attrs__()}>")
-            lst.append(self.content)
-            lst.extend([child.__render_self__() if child.oob is False else "" for child in self.children])
+        if close_tag:
+            yield close_tag
+            if self.tag == "head":
+                yield FLUSH
 
-            if not self.is_void_element:
-                lst.append(f"</{self.tag}>")
+    def __render_self__(self) -> str:
+        self.before_render()
+        if self.script:
+            self.stack.scripts.append(self.script)
+        if not self.render_html:
+            return self.after_render("")
+
+        self.__add_event_to_attributes__()
+        open_tag, close_tag = _render_plan(self.tag, tuple(self.attributes))
+        lst = [open_tag.format(*self.__attribute_values__()), self.content]
+        if self._children:
+            lst.extend([child.__render_self__() for child in self._children if child.oob is False])
+        lst.append(close_tag)
 
-        html = "".join(lst)
-        return self.after_render(html)
+        return self.after_render("".join(lst))
 
     def before_render(self):
         """This method is called before the element is rendered."""
@@ -257,7 +385,7 @@ class Element:
         return html
 
     def __add_event_to_attributes__(self) -> None:
-        if self.event == {}:
+        if not self._event:
             return
 
         self.attributes["hx-target"] = self.__get_target__(self.event.get("target"))
@@ -311,13 +439,16 @@ class Element:
 
     def __set_frame__(self, frame: Frame) -> None:
         self.stack = frame
-        for child in self.children:
+        for child in self._children or ():
             child.__set_frame__(frame)
 
     def _set_frame_and_root(self) -> None:
         self.__set_frame__(Frame.get_stack())
         self.stack.root.append(self)
 
+    def __attribute_values__(self) -> list[Any]:
+        return [value() if callable(value) else value for value in self.attributes.values()]
+
     def __dict_to_attrs__(self) -> str:
         attr_no_value = object()
         return " ".join(
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Literal
 
@@ -9,6 +8,7 @@ import humps
 from uiwiz.element import Element
 from uiwiz.elements.ace import AceOptions, SqlOptions
 from uiwiz.elements.form import Form
+from uiwiz.serialization import dumps_attribute
 
 LIB_PATH = Path(__file__).parent / "ace.min.js"
 MODE_PYTHON = Path(__file__).parent / "mode-python.js"
@@ -33,6 +33,7 @@ class Ace(
         JS_PATH,
     ],
 ):
+    __slots__ = ("options", "sql_options")
     default_options = AceOptions(
         enable_basic_autocompletion=True,
         enable_live_autocompletion=True,
@@ -89,8 +90,8 @@ class Ace(
         self.attributes["hx-ace-editor-form"] = self.__find_parent_form__()
         self.attributes["hx-ace-editor-content"] = content
 
-        self.attributes["hx-ace-editor-options"] = json.dumps(humps.camelize(self.options))
-        self.attributes["hx-ace-editor-sql-options"] = json.dumps(self.sql_options)
+        self.attributes.__setitem__("hx-ace-editor-options", dumps_attribute(humps.camelize(self.options)), False)
+        self.attributes.__setitem__("hx-ace-editor-sql-options", dumps_attribute(self.sql_options), False)
 
     def __find_parent_form__(self) -> str | None:
         parent = self.parent_element
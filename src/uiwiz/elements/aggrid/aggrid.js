@@ -1,8 +1,12 @@
 
+const ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream";
+
 htmx.defineExtension("hx-aggrid", {
     onEvent: function (name, evt) {
         if (name === "htmx:afterSettle") {
-            const response = JSON.parse(evt.detail.xhr.response);
+            const response = decodeGridResponse(evt.detail.xhr);
+            if (response === null)
+                return;
             const cols = response["cols"];
             const rows = response["rows"];
             gridHandler(evt.target, cols, rows);
@@ -10,6 +14,223 @@ htmx.defineExtension("hx-aggrid", {
     }
 });
 
+function isArrowResponse(xhr) {
+    return (xhr.getResponseHeader("content-type") || "").startsWith(ARROW_MEDIA_TYPE);
+}
+
+// Read Arrow updates of grids as bytes. The mime type can still be overridden once the headers
+// are received, so other responses, e.g. html swapped into the grid container, are left as they are
+document.addEventListener("htmx:beforeSend", function (evt) {
+    if (evt.detail.target && hasAttribute(evt.detail.target, "hx-aggrid")) {
+        const xhr = evt.detail.xhr;
+        xhr.addEventListener("readystatechange", function () {
+            if (xhr.readyState === XMLHttpRequest.HEADERS_RECEIVED && isArrowResponse(xhr))
+                xhr.overrideMimeType("text/plain; charset=x-user-defined");
+        });
+    }
+});
+
+function decodeGridResponse(xhr) {
+    if (isArrowResponse(xhr)) {
+        const text = xhr.responseText;
+        const bytes = new Uint8Array(text.length);
+        for (let i = 0; i < text.length; i++) {
+            bytes[i] = text.charCodeAt(i) & 0xff;
+        }
+        return decodeArrowStream(bytes.buffer);
+    }
+    if ((xhr.getResponseHeader("content-type") || "").startsWith("application/json"))
+        return JSON.parse(xhr.responseText);
+    // Not a grid update
+    return null;
+}
+
+// Minimal reader of the Arrow IPC stream format, for the column types sent by Aggrid.arrow_response
+const _utf8 = new TextDecoder();
+
+function flatbufferTable(view, table) {
+    const vtable = table - view.getInt32(table, true);
+    const vtableSize = view.getUint16(vtable, true);
+    const fieldOffset = (field) => {
+        const position = 4 + field * 2;
+        return position < vtableSize ? view.getUint16(vtable + position, true) : 0;
+    };
+    const reference = (field) => {
+        const offset = fieldOffset(field);
+        return offset ? table + offset + view.getUint32(table + offset, true) : null;
+    };
+    return {
+        scalar(field, read, fallback) {
+            const offset = fieldOffset(field);
+            return offset ? read(table + offset) : fallback;
+        },
+        table(field) {
+            const position = reference(field);
+            return position === null ? null : flatbufferTable(view, position);
+        },
+        vector(field) {
+            const position = reference(field);
+            return position === null ? { start: 0, length: 0 } : { start: position + 4, length: view.getUint32(position, true) };
+        },
+        string(field) {
+            const vector = this.vector(field);
+            return _utf8.decode(new Uint8Array(view.buffer, vector.start, vector.length));
+        },
+    };
+}
+
+function readArrowSchema(view, schema) {
+    const fields = [];
+    const vector = schema.vector(1);
+    for (let i = 0; i < vector.length; i++) {
+        const position = vector.start + i * 4;
+        const field = flatbufferTable(view, position + view.getUint32(position, true));
+        const type = field.table(3);
+        fields.push({
+            name: field.string(0),
+            typeId: field.scalar(2, (p) => view.getUint8(p), 0),
+            bitWidth: type ? type.scalar(0, (p) => view.getInt32(p, true), 0) : 0,
+            isSigned: type ? type.scalar(1, (p) => view.getUint8(p) === 1, false) : false,
+            precision: type ? type.scalar(0, (p) => view.getInt16(p, true), 0) : 0,
+        });
+    }
+    return fields;
+}
+
+const _intArrays = {
+    8: [Uint8Array, Int8Array],
+    16: [Uint16Array, Int16Array],
+    32: [Uint32Array, Int32Array],
+};
+
+function readArrowBatch(view, batch, body, fields, chunks) {
+    if (batch.table(3) !== null)
+        throw new Error("Compressed Arrow streams are not supported");
+
+    const nodes = batch.vector(1);
+    const buffers = batch.vector(2);
+    let bufferIndex = 0;
+    const nextBuffer = () => {
+        const position = buffers.start + 16 * bufferIndex++;
+        return {
+            start: body + Number(view.getBigInt64(position, true)),
+            length: Number(view.getBigInt64(position + 8, true)),
+        };
+    };
+    const typed = (ArrayType, buffer) => {
+        // Typed arrays need aligned offsets, copy the buffer when it is not
+        if (buffer.start % ArrayType.BYTES_PER_ELEMENT === 0)
+            return new ArrayType(view.buffer, buffer.start, buffer.length / ArrayType.BYTES_PER_ELEMENT);
+        return new ArrayType(view.buffer.slice(buffer.start, buffer.start + buffer.length));
+    };
+
+    fields.forEach((field, index) => {
+        const nodePosition = nodes.start + 16 * index;
+        const length = Number(view.getBigInt64(nodePosition, true));
+        const nullCount = Number(view.getBigInt64(nodePosition + 8, true));
+        chunks[index].push(readArrowColumn(field, length, nullCount, nextBuffer, typed, view));
+    });
+}
+
+function readArrowColumn(field, length, nullCount, nextBuffer, typed, view) {
+    if (field.typeId === 1)  // Null
+        return new Array(length).fill(null);
+
+    const validity = nextBuffer();
+    const bits = nullCount > 0 && validity.length > 0 ? new Uint8Array(view.buffer, validity.start, validity.length) : null;
+    const isValid = (i) => bits === null || ((bits[i >> 3] >> (i & 7)) & 1) === 1;
+    const values = new Array(length);
+
+    if (field.typeId === 2 && field.bitWidth === 64) {  // Int64, UInt64
+        // Combine the 32 bit halves, BigInt conversion is much slower
+        const words = typed(Int32Array, nextBuffer());
+        const numbers = bits === null ? new Float64Array(length) : values;
+        for (let i = 0; i < length; i++) {
+            const high = field.isSigned ? words[2 * i + 1] : words[2 * i + 1] >>> 0;
+            numbers[i] = isValid(i) ? high * 4294967296 + (words[2 * i] >>> 0) : null;
+        }
+        return numbers;
+    }
+    if (field.typeId === 2 || field.typeId === 3) {  // Int, FloatingPoint
+        const ArrayType = field.typeId === 3
+            ? (field.precision === 2 ? Float64Array : Float32Array)
+            : _intArrays[field.bitWidth][field.isSigned ? 1 : 0];
+        const numbers = typed(ArrayType, nextBuffer());
+        if (bits === null)  // Use the buffer as it is
+            return numbers;
+        for (let i = 0; i < length; i++) values[i] = isValid(i) ? numbers[i] : null;
+        return values;
+    }
+    if (field.typeId === 6) {  // Bool
+        const buffer = nextBuffer();
+        const data = new Uint8Array(view.buffer, buffer.start, buffer.length);
+        for (let i = 0; i < length; i++) values[i] = isValid(i) ? ((data[i >> 3] >> (i & 7)) & 1) === 1 : null;
+        return values;
+    }
+    if (field.typeId === 5 || field.typeId === 20) {  // Utf8, LargeUtf8
+        // Read the low half of 64 bit offsets, the data of a batch stays below 2 GB
+        const offsets = typed(Int32Array, nextBuffer());
+        const step = field.typeId === 20 ? 2 : 1;
+        const buffer = nextBuffer();
+        const bytes = new Uint8Array(view.buffer, buffer.start, buffer.length);
+        const text = _utf8.decode(bytes);
+        // Without multi byte characters the byte offsets are the string offsets
+        const ascii = text.length === buffer.length;
+        for (let i = 0; i < length; i++) {
+            if (!isValid(i)) {
+                values[i] = null;
+                continue;
+            }
+            const start = offsets[i * step];
+            const end = offsets[(i + 1) * step];
+            values[i] = ascii ? text.substring(start, end) : _utf8.decode(bytes.subarray(start, end));
+        }
+        return values;
+    }
+    throw new Error(`Unsupported Arrow type ${field.typeId} of column ${field.name}`);
+}
+
+function decodeArrowStream(buffer) {
+    const view = new DataView(buffer);
+    const chunks = [];
+    let fields = [];
+    let position = 0;
+    while (position + 4 <= buffer.byteLength) {
+        let length = view.getInt32(position, true);
+        position += 4;
+        if (length === -1) {  // continuation marker
+            length = view.getInt32(position, true);
+            position += 4;
+        }
+        if (length === 0)  // end of stream
+            break;
+
+        const message = flatbufferTable(view, position + view.getUint32(position, true));
+        const headerType = message.scalar(1, (p) => view.getUint8(p), 0);
+        const bodyLength = Number(message.scalar(3, (p) => view.getBigInt64(p, true), 0n));
+        const body = position + length;
+        if (headerType === 1) {  // Schema
+            fields = readArrowSchema(view, message.table(2));
+            fields.forEach(() => chunks.push([]));
+        } else if (headerType === 3) {  // RecordBatch
+            readArrowBatch(view, message.table(2), body, fields, chunks);
+        }
+        position = body + bodyLength;
+    }
+
+    const columns = chunks.map((column) => column.length === 1 ? column[0] : [].concat(...column.map((chunk) => Array.from(chunk))));
+    // The grid reads the cells from the columns, rows only carry their index
+    const cols = fields.map((field, index) => {
+        const column = columns[index];
+        return { field: field.name, valueGetter: (params) => column[params.data.__row] };
+    });
+    const rows = new Array(columns.length ? columns[0].length : 0);
+    for (let i = 0; i < rows.length; i++) {
+        rows[i] = { __row: i };
+    }
+    return { cols: cols, rows: rows };
+}
+
 function gridHandler(element, cols, rows) {
     if (!hasAttribute(element, "hx-aggrid"))
         return;
@@ -32,12 +253,57 @@ function getGridOptions(cols, rows) {
     return gridOptions;
 }
 
+function getServerSideGridOptions(cols, source, blockSize) {
+    return {
+        defaultColDef: {
+            resizable: true,
+        },
+        columnDefs: cols,
+        rowModelType: 'infinite',
+        cacheBlockSize: blockSize,
+        maxBlocksInCache: 20,
+        datasource: {
+            getRows: function (params) {
+                fetch(source, {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify({
+                        startRow: params.startRow,
+                        endRow: params.endRow,
+                        sortModel: params.sortModel,
+                        filterModel: params.filterModel,
+                    }),
+                })
+                    .then(async response => {
+                        if (!response.ok) {
+                            const error = await response.json().catch(() => ({}));
+                            throw new Error(error.detail || response.statusText);
+                        }
+                        return response.json();
+                    })
+                    .then(data => params.successCallback(data.rows, data.lastRow))
+                    .catch(error => {
+                        console.error("Failed to load grid rows:", error.message);
+                        params.failCallback();
+                    });
+            }
+        },
+    };
+}
+
 function createOrGetCurrentGrid(element, cols, rows) {
     var gridApi = null;
     if (element.id in _uiWizardGrids) {
         gridApi = _uiWizardGrids[element.id]
         gridApi.setGridOption('columnDefs', cols);
         gridApi.setGridOption('rowData', rows);
+    } else if (hasAttribute(element, "hx-aggrid-source")) {
+        const cols = JSON.parse(getAttributeFromElement(element, "hx-aggrid-cols"));
+        const source = getAttributeFromElement(element, "hx-aggrid-source");
+        const blockSize = parseInt(getAttributeFromElement(element, "hx-aggrid-block-size"));
+
+        gridApi = agGrid.createGrid(element, getServerSideGridOptions(cols, source, blockSize));
+        _uiWizardGrids[element.id] = gridApi;
     } else {
         const cols = JSON.parse(getAttributeFromElement(element, "hx-aggrid-cols"));
         const rows = JSON.parse(getAttributeFromElement(element, "hx-aggrid-rows"));
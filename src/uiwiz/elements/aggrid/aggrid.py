@@ -1,14 +1,21 @@
 from __future__ import annotations
 
-import html
-import json
+import io
+import operator
+from collections.abc import Callable
 from enum import Enum
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
+from uuid import uuid4
 
-from fastapi.responses import JSONResponse
+from fastapi import HTTPException
+from fastapi.responses import Response
+from pydantic import BaseModel
 
 from uiwiz.element import Element
+from uiwiz.frame import Frame
+from uiwiz.serialization import UiwizJSONResponse, dumps_attribute
+from uiwiz.shared import SourceCache, route_exists
 
 if TYPE_CHECKING:
     import polars as pl
@@ -23,10 +30,135 @@ class OPTIONS(str, Enum):
     fitColumnContent = "sizeToFit"
 
 
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+ROWS_ENDPOINT = "/_uiwiz/aggrid/{token}"
+MAX_SOURCES = 128
+MAX_BLOCK_SIZE = 1000
+
+# DataFrames of the server side grids that are rendered, set ``grid_sources.maxsize`` and
+# ``grid_sources.max_bytes`` to change how many are kept
+grid_sources: SourceCache[pl.DataFrame] = SourceCache(lambda df: df.estimated_size(), maxsize=MAX_SOURCES)
+
+
+class RowBlock(BaseModel):
+    """The request of the AG Grid infinite row model for a block of rows."""
+
+    startRow: int = 0  # noqa: N815
+    endRow: int = 100  # noqa: N815
+    sortModel: list[dict[str, Any]] = []  # noqa: N815
+    filterModel: dict[str, Any] = {}  # noqa: N815
+
+
+_COMPARISONS: dict[str, Callable[[Any, Any], Any]] = {
+    "equals": operator.eq,
+    "notEqual": operator.ne,
+    "lessThan": operator.lt,
+    "lessThanOrEqual": operator.le,
+    "greaterThan": operator.gt,
+    "greaterThanOrEqual": operator.ge,
+}
+_TEXT_MATCHES: dict[str, Callable[[pl.Expr, str], pl.Expr]] = {
+    "contains": lambda text, value: text.str.contains(value, literal=True),
+    "notContains": lambda text, value: ~text.str.contains(value, literal=True),
+    "startsWith": lambda text, value: text.str.starts_with(value),
+    "endsWith": lambda text, value: text.str.ends_with(value),
+}
+
+
+def _to_strings(series: pl.Series) -> pl.Series:
+    import polars as pl
+
+    return pl.Series([None if value is None else str(value) for value in series.to_list()], dtype=pl.String)
+
+
+def _compare(col: pl.Expr, kind: str | None, value: Any, value_to: Any) -> pl.Expr | None:  # noqa: ANN401
+    if kind == "inRange":
+        return col.is_between(value, value_to)
+    if kind in _COMPARISONS:
+        return _COMPARISONS[kind](col, value)
+    return None
+
+
+def _filter_expr(df: pl.DataFrame, column: str, model: dict[str, Any]) -> pl.Expr | None:  # noqa: PLR0911
+    """Translate the filter model of a column to a polars expression, None for unsupported filters."""
+    import polars as pl
+
+    if "conditions" in model:
+        conditions = [_filter_expr(df, column, item) for item in model["conditions"]]
+        conditions = [condition for condition in conditions if condition is not None]
+        if not conditions:
+            return None
+        return pl.any_horizontal(conditions) if model.get("operator") == "OR" else pl.all_horizontal(conditions)
+
+    col = pl.col(column)
+    kind = model.get("type")
+    if kind in {"blank", "notBlank"}:
+        return col.is_null() if kind == "blank" else col.is_not_null()
+
+    if model.get("filterType") == "number":
+        return _compare(col, kind, model.get("filter"), model.get("filterTo"))
+    if model.get("filterType") == "date":
+        # Dates are sent as "YYYY-MM-DD hh:mm:ss"
+        date_from, date_to = (
+            None if value is None else pl.lit(value).str.to_datetime().cast(df.schema[column])
+            for value in (model.get("dateFrom"), model.get("dateTo"))
+        )
+        return _compare(col, kind, date_from, date_to)
+
+    # Text filters are case insensitive like the filters of the grid
+    text = col.cast(pl.String).str.to_lowercase()
+    value = str(model.get("filter") or "").lower()
+    if kind in _TEXT_MATCHES:
+        return _TEXT_MATCHES[kind](text, value)
+    return _compare(text, kind, value, None)
+
+
+def query_rows(df: pl.DataFrame, block: RowBlock) -> tuple[pl.DataFrame, int]:
+    """Filter, sort and slice a DataFrame for a block of the infinite row model.
+
+    Columns that are not in the DataFrame are ignored.
+
+    :param df: The DataFrame of the grid
+    :param block: The requested block
+    :return: The rows of the block and the number of rows after filtering
+    """
+    import polars as pl
+
+    lazy = df.lazy()
+    filters = [_filter_expr(df, column, model) for column, model in block.filterModel.items() if column in df.schema]
+    filters = [expr for expr in filters if expr is not None]
+    if filters:
+        lazy = lazy.filter(filters)
+
+    sort = [item for item in block.sortModel if item.get("colId") in df.schema]
+    start = max(block.startRow, 0)
+    length = min(max(block.endRow - start, 0), MAX_BLOCK_SIZE)
+    rows = lazy
+    if sort:
+        rows = rows.sort(
+            [item["colId"] for item in sort],
+            descending=[item.get("sort") == "desc" for item in sort],
+            nulls_last=True,
+            maintain_order=True,
+        )
+    rows, count = pl.collect_all([rows.slice(start, length), lazy.select(pl.len())])
+    return rows, count.item()
+
+
+def _serve_rows(token: str, block: RowBlock) -> Response:
+    df = grid_sources.get(token)
+    if df is None:
+        # Evicted, or rendered by another worker
+        raise HTTPException(status_code=404, detail="Grid data is no longer available, reload the page")
+    rows, count = query_rows(df, block)
+    return UiwizJSONResponse({"rows": rows, "lastRow": count})
+
+
 class Aggrid(Element, extensions=[CSS_PATH, LIB_PATH, JS_PATH]):
+    __slots__ = ()
     _classes: str = "ag-theme-quartz ag-theme-uiwiz w-full"
 
-    def __init__(self, df: pl.DataFrame | None) -> None:
+    def __init__(self, df: pl.DataFrame | None, *, server_side: bool = False, block_size: int = 100) -> None:
         """Aggrid
 
         Use aggrid to display a DataFrame in a grid format.
@@ -45,19 +177,61 @@ class Aggrid(Element, extensions=[CSS_PATH, LIB_PATH, JS_PATH]):
             })
             ui.aggrid(df)
 
+        With ``server_side`` the rows are not part of the page. The grid uses the infinite
+        row model and fetches blocks of rows, sorted and filtered by polars on the server,
+        while it is scrolled. The page size does not depend on the size of the DataFrame.
+
+        .. code-block:: python
+
+            ui.aggrid(large_df, server_side=True, block_size=200)
+
+        The DataFrame is kept in the memory of the worker that rendered the grid, the least
+        recently used are dropped (see ``grid_sources``). When more than one worker runs, the
+        requests of a client must be routed to the same worker.
+
         :param df: The DataFrame to display in the grid
+        :param server_side: Serve the rows in blocks from the server
+        :param block_size: The number of rows in a block when ``server_side`` is set
 
         """
         super().__init__("div")
         self.classes(Aggrid._classes)
+        self.attributes["hx-ext"] = "hx-aggrid"
 
-        cols, rows = Aggrid.create_cols_and_rows(df)
+        if server_side and df is not None:
+            token = uuid4().hex
+            grid_sources.set(token, df)
+            if not route_exists(ROWS_ENDPOINT):
+                Frame.get_stack().app.post(ROWS_ENDPOINT, include_in_schema=False)(_serve_rows)
 
-        self.attributes["hx-ext"] = "hx-aggrid"
+            cols = dumps_attribute(Aggrid.create_server_side_cols(df))
+            self.attributes.__setitem__("hx-aggrid-cols", cols, False)
+            self.attributes["hx-aggrid-source"] = ROWS_ENDPOINT.format(token=token)
+            self.attributes["hx-aggrid-block-size"] = min(block_size, MAX_BLOCK_SIZE)
+            # The infinite row model needs a fixed height
+            self.attributes["style"] = "height: 32rem"
+            self.attributes["hx-aggrid"] = "/data"
+            return
+
+        cols, rows = Aggrid.create_cols_and_rows(df)
         self.attributes.__setitem__("hx-aggrid-cols", cols, False)
         self.attributes.__setitem__("hx-aggrid-rows", rows, False)
         self.attributes["hx-aggrid"] = "/data"
 
+    @staticmethod
+    def create_server_side_cols(df: pl.DataFrame) -> list[dict[str, Any]]:
+        """Column definitions with the filter matching the type of each column."""
+        cols = []
+        for name, dtype in df.schema.items():
+            if dtype.is_numeric():
+                column_filter = "agNumberColumnFilter"
+            elif dtype.is_temporal():
+                column_filter = "agDateColumnFilter"
+            else:
+                column_filter = "agTextColumnFilter"
+            cols.append({"field": name, "filter": column_filter, "sortable": True})
+        return cols
+
     @staticmethod
     def create_cols_and_rows(
         df: pl.DataFrame | None,
@@ -70,13 +244,54 @@ class Aggrid(Element, extensions=[CSS_PATH, LIB_PATH, JS_PATH]):
             cols = [{"field": item} for item in df.columns]
             rows = df.to_dicts()
             if escape:
-                cols = html.escape(json.dumps(cols))
-                rows = html.escape(json.dumps(rows, default=str))
+                cols = dumps_attribute(cols)
+                rows = dumps_attribute(rows)
 
         return cols, rows
 
     @staticmethod
-    def response(df: pl.DataFrame | None, headers: dict[str, str] = {}) -> JSONResponse:
+    def response(df: pl.DataFrame | None, headers: dict[str, str] = {}) -> UiwizJSONResponse:
         _headers = {"HX-Trigger": "aggridUpdate"} | headers
         cols, rows = Aggrid.create_cols_and_rows(df, False)
-        return JSONResponse({"cols": cols, "rows": rows}, headers=_headers)
+        return UiwizJSONResponse({"cols": cols, "rows": rows}, headers=_headers)
+
+    @staticmethod
+    def arrow_response(df: pl.DataFrame | None, headers: dict[str, str] = {}) -> Response:
+        """Update a grid like :meth:`response`, with the DataFrame sent as an Arrow IPC stream.
+
+        Arrow is written straight from the columns of the DataFrame, which is much faster and
+        smaller than json for large frames. Columns other than numbers, booleans and strings are
+        sent as strings.
+
+        :param df: The DataFrame to display in the grid
+        :param headers: Extra response headers
+        :return: The response with the ``application/vnd.apache.arrow.stream`` media type
+        """
+        _headers = {"HX-Trigger": "aggridUpdate"} | headers
+        return Response(content=Aggrid.to_arrow(df), media_type=ARROW_MEDIA_TYPE, headers=_headers)
+
+    @staticmethod
+    def to_arrow(df: pl.DataFrame | None) -> bytes:
+        """Write a DataFrame as an Arrow IPC stream with the column types aggrid.js can read.
+
+        :param df: The DataFrame to write, None writes an empty stream
+        :return: The uncompressed Arrow IPC stream
+        """
+        import polars as pl
+
+        if df is None:
+            df = pl.DataFrame()
+        casts = []
+        for name, dtype in df.schema.items():
+            if dtype.is_nested() or dtype in {pl.Object, pl.Binary}:
+                casts.append(pl.col(name).map_batches(_to_strings, return_dtype=pl.String))
+            elif not (dtype.is_integer() or dtype in {pl.Float32, pl.Float64, pl.Boolean, pl.String, pl.Null}):
+                casts.append(pl.col(name).cast(pl.String))
+        if casts:
+            df = df.with_columns(casts)
+        buffer = io.BytesIO()
+        # A record batch is written per chunk, one batch lets aggrid.js use the buffers as they are
+        df = df.rechunk()
+        # The oldest format uses the plain string layout instead of string views
+        df.write_ipc_stream(buffer, compat_level=pl.CompatLevel.oldest())
+        return buffer.getvalue()
@@ -2,6 +2,7 @@ from uiwiz.element import Element
 
 
 class Avatar(Element):
+    __slots__ = ("container",)
     root_class: str = "avatar"
     _classes_inner: str = "w-{size} rounded-full"
 
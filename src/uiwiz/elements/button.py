@@ -9,6 +9,7 @@ if TYPE_CHECKING:
 
 
 class Button(OnEvent):
+    __slots__ = ()
     root_class: str = "btn"
     root_size: str = "btn-{size}"
 
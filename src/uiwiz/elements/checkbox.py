@@ -2,6 +2,7 @@ from uiwiz.elements.extensions.on_event import OnEvent
 
 
 class Checkbox(OnEvent):
+    __slots__ = ()
     root_class: str = "checkbox"
     root_size: str = "checkbox-{size}"
 
@@ -2,6 +2,7 @@ from uiwiz.element import Element
 
 
 class Container(Element):
+    __slots__ = ("__root_class__",)
     root_class: str = "container flex flex-col mx-auto {max_w} {padding} {space_y} grow"
 
     def __init__(self, max_w: str = "max-w-[960px]", padding: str = "pt-4 pb-4", space_y: str = "space-y-4") -> None:
@@ -9,6 +9,7 @@ if TYPE_CHECKING:
 
 
 class Datepicker(OnEvent):
+    __slots__ = ()
     root_class: str = "input "
 
     def __init__(
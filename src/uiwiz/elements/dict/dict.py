@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import numbers
 from collections.abc import Iterable
 from pathlib import Path
@@ -8,12 +7,23 @@ from pathlib import Path
 from uiwiz.element import Element
 from uiwiz.elements.button import Button
 from uiwiz.elements.html import Html
+from uiwiz.serialization import dumps_attribute
 from uiwiz.svg.svg_handler import get_svg
 
 JS_PATH = Path(__file__).parent / "copy.js"
 
 
 class Dict(Element, extensions=[JS_PATH]):
+    __slots__ = (
+        "_border_classes",
+        "_border_position",
+        "copy_to_clipboard",
+        "data",
+        "did_render",
+        "key_class",
+        "value_class",
+    )
+
     def __init__(self, data: Iterable[dict] | dict, copy_to_clipboard: bool = False) -> None:
         """Dict element
 
@@ -128,5 +138,5 @@ class Dict(Element, extensions=[JS_PATH]):
                     icon = Html(content=get_svg("copy")).classes("w-6 h-6")
                     icon.attributes["style"] = "fill: var(--color-base-content);"
 
-                    btn.attributes["data-copy-data"] = json.dumps(data, indent=2)
+                    btn.attributes.__setitem__("data-copy-data", dumps_attribute(data, indent=True), False)
             format_data(data, is_last_item=True)
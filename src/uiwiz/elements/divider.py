@@ -2,6 +2,7 @@ from uiwiz.element import Element
 
 
 class Divider(Element):
+    __slots__ = ()
     root_class = "divider "
     _classes_hor = "divider-horizontal"
 
@@ -8,6 +8,7 @@ from uiwiz.svg.svg_handler import get_svg
 
 
 class DrawerSetup(Element):
+    __slots__ = ()
     _classes: str = "menu p-4 w-80 min-h-full bg-base-200 text-base-content"
 
     def __init__(self) -> None:
@@ -16,6 +17,7 @@ class DrawerSetup(Element):
 
 
 class DrawerSide(Element):
+    __slots__ = ("close_label", "drawer_toggle", "setup")
     _classes: str = "drawer-side z-50"
 
     def __init__(self, drawer_toggle: Checkbox) -> None:
@@ -38,6 +40,7 @@ class DrawerSide(Element):
 
 
 class DrawerContent(Element):
+    __slots__ = ()
     _classes: str = "drawer-content flex flex-col min-h-screen"
 
     def __init__(self) -> None:
@@ -46,6 +49,7 @@ class DrawerContent(Element):
 
 
 class Drawer(Element):
+    __slots__ = ("__drawer_button_menu__", "_drawer_content", "drawer_toggle", "side")
     _classes: str = "drawer bg-base-100"
 
     def __init__(self, always_open: bool = False, right: bool = False) -> None:
@@ -9,6 +9,7 @@ DropdownItem = namedtuple("DropdownItem", ["name", "value"])
 
 
 class Dropdown(OnEvent):
+    __slots__ = ()
     root_class: str = "select "
     root_size: str = "select-{size}"
     _classes: str = "select-bordered w-full max-w-xs"
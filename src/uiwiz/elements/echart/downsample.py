@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+from typing import Any, Literal
+
+import polars as pl
+
+DOWNSAMPLE_MODE = Literal["lttb", "minmax"]
+
+
+def _points(data: Any) -> pl.DataFrame | None:  # noqa: ANN401, PLR0911
+    if isinstance(data, pl.DataFrame):
+        if data.width < 2:  # noqa: PLR2004
+            return None
+        return data.select(pl.col(data.columns[0]).alias("value"), pl.col(data.columns[1]).alias("y"))
+    if isinstance(data, pl.Series):
+        return pl.DataFrame({"value": pl.int_range(data.len(), eager=True), "y": data})
+    if not isinstance(data, (list, tuple)) or not data:
+        return None
+    try:
+        if isinstance(data[0], (list, tuple)):
+            return pl.DataFrame(data, schema=["value", "y"], orient="row", strict=False)
+        return pl.DataFrame({"value": pl.int_range(len(data), eager=True), "y": data}, strict=False)
+    except (pl.exceptions.PolarsError, TypeError, ValueError):
+        return None
+
+
+def _x_values(dtype: pl.DataType) -> pl.Expr | None:
+    if dtype.is_numeric():
+        return pl.col("value").cast(pl.Float64)
+    if dtype.is_temporal():
+        return pl.col("value").cast(pl.Datetime("ms")).dt.epoch("ms").cast(pl.Float64)
+    if dtype == pl.String:
+        return pl.col("value").str.to_datetime(strict=False).dt.epoch("ms").cast(pl.Float64)
+    return None
+
+
+def series_frame(data: Any) -> pl.DataFrame | None:  # noqa: ANN401
+    """Convert the data of an EChart series to a frame with a numeric ``x``, the output ``value`` and ``y``.
+
+    Supports a list of values, a list of ``[x, y]`` pairs, a polars Series of values and a polars
+    DataFrame with the x and y columns first. Time values and date strings are compared as epoch
+    milliseconds, like a time axis does. Returns None for other formats, e.g. data items with options.
+    """
+    frame = _points(data)
+    if frame is None or not frame.schema["y"].is_numeric():
+        return None
+    x = _x_values(frame.schema["value"])
+    if x is None:
+        return None
+    frame = frame.with_columns(x=x, y=pl.col("y").cast(pl.Float64))
+    if frame["x"].null_count():
+        return None
+    return frame
+
+
+def lttb_indices(x: pl.Series, y: pl.Series, threshold: int) -> pl.Series:
+    """Select the points of Largest Triangle Three Buckets downsampling.
+
+    The first and last points are kept and the points between are split in ``threshold - 2``
+    buckets. From every bucket the point forming the largest triangle with the neighbouring buckets
+    is kept. The previous bucket is represented by its mean instead of its selected point, so all
+    buckets are computed at once with polars instead of one after the other.
+
+    :param x: the x values, sorted
+    :param y: the y values
+    :param threshold: the number of points to keep
+    :return: the sorted indices of the points to keep
+    """
+    length = x.len()
+    if threshold >= length or threshold < 3:  # noqa: PLR2004
+        return pl.int_range(length, eager=True)
+
+    buckets = threshold - 2
+    points = pl.DataFrame({"index": pl.int_range(length, eager=True), "x": x, "y": y})
+    inner = points.slice(1, length - 2).with_columns(
+        bucket=((pl.col("index") - 1) * buckets // (length - 2)),
+    )
+    first, last = points.row(0, named=True), points.row(length - 1, named=True)
+    means = (
+        inner.group_by("bucket")
+        .agg(pl.col("x").mean().alias("mean_x"), pl.col("y").drop_nulls().mean().alias("mean_y"))
+        .sort("bucket")
+        .with_columns(
+            a_x=pl.col("mean_x").shift(1, fill_value=first["x"]),
+            a_y=pl.col("mean_y").shift(1, fill_value=first["y"]),
+            c_x=pl.col("mean_x").shift(-1, fill_value=last["x"]),
+            c_y=pl.col("mean_y").shift(-1, fill_value=last["y"]),
+        )
+    )
+    area = (
+        (pl.col("a_x") - pl.col("c_x")) * (pl.col("y") - pl.col("a_y"))
+        - (pl.col("a_x") - pl.col("x")) * (pl.col("c_y") - pl.col("a_y"))
+    ).abs()
+    selected = (
+        inner.join(means, on="bucket")
+        .with_columns(area=area.fill_nan(None).fill_null(-1.0))
+        .group_by("bucket")
+        .agg(pl.col("index").get(pl.col("area").arg_max()))
+        .get_column("index")
+    )
+    return pl.concat([pl.Series("index", [0, length - 1], dtype=selected.dtype), selected]).unique().sort()
+
+
+def min_max_indices(x: pl.Series, y: pl.Series, threshold: int) -> pl.Series:
+    """Select the minimum and maximum of ``threshold / 2`` buckets of equal width on x.
+
+    Keeps the peaks of the series, the first and last points are always kept.
+
+    :param x: the x values, sorted
+    :param y: the y values
+    :param threshold: the number of points to keep
+    :return: the sorted indices of the points to keep
+    """
+    length = x.len()
+    if threshold >= length or threshold < 4:  # noqa: PLR2004
+        return pl.int_range(length, eager=True)
+
+    buckets = threshold // 2 - 1
+    start, end = x[0], x[-1]
+    width = (end - start) / buckets if end > start else 1.0
+    points = pl.DataFrame({"index": pl.int_range(length, eager=True), "x": x, "y": y}).with_columns(
+        bucket=((pl.col("x") - start) / width).floor().clip(0, buckets - 1),
+    )
+    extremes = (
+        points.drop_nulls("y")
+        .group_by("bucket")
+        .agg(
+            pl.col("index").get(pl.col("y").arg_min()).alias("min"),
+            pl.col("index").get(pl.col("y").arg_max()).alias("max"),
+        )
+    )
+    selected = pl.concat([extremes.get_column("min"), extremes.get_column("max")])
+    return pl.concat([pl.Series("min", [0, length - 1], dtype=selected.dtype), selected]).unique().sort()
+
+
+def downsample(frame: pl.DataFrame, threshold: int, mode: DOWNSAMPLE_MODE = "lttb") -> pl.DataFrame:
+    """Reduce a frame from :func:`series_frame` to about ``threshold`` points.
+
+    :param frame: the points, sorted on x
+    :param threshold: the number of points to keep
+    :param mode: ``lttb`` keeps the visual shape, ``minmax`` keeps the peaks of every bucket
+    """
+    if frame.height <= threshold:
+        return frame
+    select = lttb_indices if mode == "lttb" else min_max_indices
+    return frame[select(frame["x"], frame["y"], threshold)]
+
+
+def zoomed(
+    frame: pl.DataFrame,
+    threshold: int,
+    mode: DOWNSAMPLE_MODE,
+    start: float | None,
+    end: float | None,
+) -> pl.DataFrame:
+    """Downsample the points between start and end with the full budget and the rest with the overview.
+
+    The points outside the range keep the extent of the axis the same, so the zoom window of the
+    chart stays where it is when the data is replaced.
+    """
+    overview = downsample(frame, threshold, mode)
+    if start is None and end is None:
+        return overview
+    in_range = pl.col("x").is_between(
+        start if start is not None else float("-inf"),
+        end if end is not None else float("inf"),
+    )
+    detail = downsample(frame.filter(in_range), threshold, mode)
+    return pl.concat([overview.filter(~in_range), detail]).sort("x")
+
+
+def series_data(frame: pl.DataFrame) -> list[list[Any]]:
+    """Return the points as ``[x, y]`` pairs with the original x values."""
+    return [list(row) for row in frame.select("value", "y").iter_rows()]
@@ -8,6 +8,10 @@ class UIWizardEChart {
         this.element = element;
         this.chart = echarts.init(element, "westeros");
         this.options = options;
+        this.zoomSource = getAttributeFromElement(element, `${dataEChartName}-zoom`);
+        this.zoomRequest = 0;
+        // The data of the named series, points are appended to it
+        this.seriesData = {};
         this.setOptions(options);
         this.addListeners();
         // Listen for attribute changes on the chart element (e.g., theme changes)
@@ -24,11 +28,81 @@ class UIWizardEChart {
     }
     setOptions(options) {
         this.chart.setOption(options);
+        this.trackSeries(options.series);
+    }
+    trackSeries(series) {
+        if (!series)
+            return;
+        (Array.isArray(series) ? series : [series]).forEach((item) => {
+            if (item.name === undefined)
+                return;
+            if (Array.isArray(item.data))
+                this.seriesData[item.name] = item.data.slice();
+            else if (!(item.name in this.seriesData))
+                this.seriesData[item.name] = [];
+        });
+    }
+    append(points, window) {
+        const series = [];
+        for (const [name, data] of Object.entries(points)) {
+            // Points can only be appended to the series of the options
+            const current = this.seriesData[name];
+            if (!current)
+                continue;
+            for (const point of data)
+                current.push(point);
+            if (window && current.length > window)
+                current.splice(0, current.length - window);
+            series.push({ name: name, data: current });
+        }
+        // The series are merged by name, the other options are left as they are
+        this.chart.setOption({ series: series });
+    }
+    currentSeries() {
+        return Object.entries(this.seriesData).map(([name, data]) => ({ name: name, data: data }));
     }
     addListeners() {
         window.addEventListener("resize", () => {
             this.chart.resize();
         });
+        if (this.zoomSource) {
+            this.chart.on("datazoom", () => {
+                clearTimeout(this.zoomTimeout);
+                this.zoomTimeout = setTimeout(() => this.fetchZoomed(), 200);
+            });
+        }
+    }
+    fetchZoomed() {
+        // The server downsamples the zoomed range again at a higher resolution
+        if (!this.zoomSource)
+            return;
+        const zoom = this.chart.getOption().dataZoom[0];
+        const request = ++this.zoomRequest;
+        fetch(this.zoomSource, {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({
+                start: zoom.start > 0 ? zoom.startValue : null,
+                end: zoom.end < 100 ? zoom.endValue : null,
+            }),
+        })
+            .then(async response => {
+                if (response.status === 404) {
+                    // The data was dropped by the server, keep the points the chart has
+                    const error = await response.json().catch(() => ({}));
+                    this.zoomSource = null;
+                    throw new Error(error.detail || response.statusText);
+                }
+                if (!response.ok)
+                    throw new Error(response.statusText);
+                return response.json();
+            })
+            .then(data => {
+                // Only the latest zoom is applied when the responses arrive out of order
+                if (request === this.zoomRequest)
+                    this.chart.setOption(data);
+            })
+            .catch(error => console.error("Failed to load zoomed chart data:", error.message));
     }
     recreate() {
         console.log("Recreating ECharts instance");
@@ -36,7 +110,8 @@ class UIWizardEChart {
         this.element._uiWizardEChart = null;
         this.chart = echarts.init(this.element, "westeros");
         this.element._uiWizardEChart = this;
-        this.setOptions(this.options);
+        this.chart.setOption(this.options);
+        this.chart.setOption({ series: this.currentSeries() });
         this.addListeners();
     }
 }
@@ -57,12 +132,32 @@ function eChartHandler(element) {
         return;
     const chartOptions = JSON.parse(getAttributeFromElement(element, `${dataEChartName}-options`));
     element._uiWizardEChart = new UIWizardEChart(element, chartOptions);
+    const stream = getAttributeFromElement(element, `${dataEChartName}-stream`);
+    if (stream)
+        streamEChart(element, stream);
 }
 
 function updateEChart(element, chartOptions) {
-    if (element._uiWizardEChart) {
+    if (!element._uiWizardEChart)
+        return;
+    if (chartOptions.append)
+        element._uiWizardEChart.append(chartOptions.append, chartOptions.window);
+    else
         element._uiWizardEChart.setOptions(chartOptions);
-    }
+}
+
+function streamEChart(element, url) {
+    const source = new EventSource(url);
+    source.onmessage = (event) => {
+        // Stop the stream when the chart is swapped out of the page
+        if (!document.body.contains(element)) {
+            source.close();
+            return;
+        }
+        updateEChart(element, JSON.parse(event.data));
+    };
+    // Sent when the stream has ended, otherwise the browser reconnects and appends the points again
+    source.addEventListener("close", () => source.close());
 }
 
 var dataEChartElements = document.querySelectorAll(`[${dataEChartName}]`);
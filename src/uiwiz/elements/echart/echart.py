@@ -1,20 +1,86 @@
-import json
+from __future__ import annotations
+
 from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+from uuid import uuid4
 
-from fastapi.responses import JSONResponse
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 
 from uiwiz.element import Element
 from uiwiz.elements.echart.themes import WONDERLAND
+from uiwiz.frame import Frame
+from uiwiz.serialization import UiwizJSONResponse, dumps, dumps_attribute
+from uiwiz.shared import SourceCache, route_exists
+from uiwiz.sse import EVENT_STREAM_HEADERS, EVENT_STREAM_MEDIA_TYPE, HEARTBEAT_INTERVAL, event_stream, format_event
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, AsyncIterable
+
+    import polars as pl
+
+    from uiwiz.elements.echart.downsample import DOWNSAMPLE_MODE
 
 LIB_PATH = Path(__file__).parent / "echart.min.js"
 JS_PATH = Path(__file__).parent / "echart.js"
 THEME_PATH = Path(__file__).parent / "echart.theme.js"
 
+ZOOM_ENDPOINT = "/_uiwiz/echart/{token}"
+MAX_SOURCES = 128
+
+
+class ChartSource(NamedTuple):
+    """The full resolution series of a downsampled chart, by the index of the series."""
+
+    series: dict[int, pl.DataFrame]
+    max_points: int
+    mode: DOWNSAMPLE_MODE
+
+
+def _source_size(source: ChartSource) -> int:
+    return sum(frame.estimated_size() for frame in source.series.values())
+
+
+# Series of the downsampled charts that are rendered, set ``chart_sources.maxsize`` and
+# ``chart_sources.max_bytes`` to change how many are kept
+chart_sources: SourceCache[ChartSource] = SourceCache(_source_size, maxsize=MAX_SOURCES)
+
+
+class ZoomRange(BaseModel):
+    """The x range of the ECharts ``dataZoom`` window, None when the window starts or ends at the data."""
+
+    start: float | None = None
+    end: float | None = None
+
+
+def _serve_zoom(token: str, zoom: ZoomRange) -> UiwizJSONResponse:
+    from uiwiz.elements.echart.downsample import series_data, zoomed
+
+    source = chart_sources.get(token)
+    if source is None:
+        # Evicted, or rendered by another worker
+        raise HTTPException(status_code=404, detail="Chart data is no longer available, reload the page")
+    # Series that are not downsampled are left as they are, ECharts merges the series by index
+    series = [{} for _ in range(max(source.series) + 1)]
+    for index, frame in source.series.items():
+        series[index] = {"data": series_data(zoomed(frame, source.max_points, source.mode, zoom.start, zoom.end))}
+    return UiwizJSONResponse({"series": series})
+
 
 class EChart(Element, extensions=[LIB_PATH, THEME_PATH, JS_PATH]):
+    __slots__ = ()
     name: str = "data-wz-echart"
 
-    def __init__(self, options: dict, height: str = "h-80") -> None:
+    def __init__(
+        self,
+        options: dict,
+        height: str = "h-80",
+        *,
+        max_points: int | None = None,
+        downsample: DOWNSAMPLE_MODE = "lttb",
+        stream: str | None = None,
+    ) -> None:
         """EChart element
 
         See https://echarts.apache.org/examples/en/index.html for examples
@@ -36,23 +102,148 @@ class EChart(Element, extensions=[LIB_PATH, THEME_PATH, JS_PATH]):
 
                 ui.echart(options)
 
+        With ``max_points`` a series with more points is downsampled on the server before it is
+        sent to the browser. The data of the series can be a list of values, a list of ``[x, y]``
+        pairs or a polars DataFrame with the x and y columns, sorted on x. When the chart is zoomed
+        the points in the zoomed range are fetched again at a higher resolution. The full series
+        are kept in the memory of the worker that rendered the chart, the least recently used are
+        dropped (see ``chart_sources``). When more than one worker runs, the requests of a client
+        must be routed to the same worker.
+
+        .. code-block:: python
+
+                options = {
+                    "xAxis": {"type": "time"},
+                    "yAxis": {},
+                    "series": [{"type": "line", "data": df.select("timestamp", "value")}],
+                }
+                ui.echart(options, max_points=2000, downsample="minmax")
+
         :param options: EChart options
         :param height: Height of the chart container
+        :param max_points: The number of points a series can have before it is downsampled
+        :param downsample: ``lttb`` keeps the shape of the series, ``minmax`` keeps the minimum
+            and maximum of every bucket so peaks are never dropped
+        :param stream: the path of an event stream from :meth:`EChart.stream` with points to append
         """
         with Element() as container:
             container.classes(f"flex justify-center relative overflow-hidden items-center {height}")
             super().__init__()
 
         self.attributes[EChart.name] = EChart.name
-        self.attributes[f"{EChart.name}-options"] = json.dumps({**options, **WONDERLAND})
+        if max_points is not None:
+            options = self.downsample(options, max_points, downsample)
+        self.attributes.__setitem__(f"{EChart.name}-options", dumps_attribute({**options, **WONDERLAND}), False)
         self.attributes["hx-ext"] = EChart.name
+        if stream is not None:
+            self.attributes[f"{EChart.name}-stream"] = stream
         self.classes("w-full h-full")
 
-    def container_classes(self, input: str) -> "EChart":
+    def downsample(self, options: dict, max_points: int, mode: DOWNSAMPLE_MODE) -> dict:
+        from uiwiz.elements.echart.downsample import downsample, series_data, series_frame
+
+        series = options.get("series")
+        if isinstance(series, dict):
+            series = [series]
+        if not isinstance(series, list):
+            return options
+
+        frames = {}
+        downsampled = []
+        for index, item in enumerate(series):
+            data = item.get("data") if isinstance(item, dict) else None
+            frame = series_frame(data) if data is not None and len(data) > max_points else None
+            if frame is None:
+                downsampled.append(item)
+                continue
+            frames[index] = frame
+            downsampled.append({**item, "data": series_data(downsample(frame, max_points, mode))})
+        if not frames:
+            return options
+
+        token = uuid4().hex
+        chart_sources.set(token, ChartSource(frames, max_points, mode))
+        if not route_exists(ZOOM_ENDPOINT):
+            Frame.get_stack().app.post(ZOOM_ENDPOINT, include_in_schema=False)(_serve_zoom)
+        self.attributes[f"{EChart.name}-zoom"] = ZOOM_ENDPOINT.format(token=token)
+        # The zoom events are what fetch the higher resolution data
+        return {"dataZoom": [{"type": "inside"}, {"type": "slider"}], **options, "series": downsampled}
+
+    def container_classes(self, input: str) -> EChart:
         self.parent_element.classes(input)
         return self
 
     @staticmethod
-    def response(data: dict, headers: dict[str, str] = {}) -> JSONResponse:
-        _headers = {"HX-Trigger": json.dumps({"uiwizUpdateEChart": data})} | headers
-        return JSONResponse(data, headers=_headers)
+    def response(data: dict, headers: dict[str, str] = {}) -> UiwizJSONResponse:
+        """Update the options of the chart targeted by the request, the options are merged.
+
+        The options are sent in the body, the ``uiwizUpdateEChart`` event is triggered without them
+        so large options do not hit the header size limits of servers and proxies.
+        """
+        _headers = {"HX-Trigger": "uiwizUpdateEChart"} | headers
+        return UiwizJSONResponse(data, headers=_headers)
+
+    @staticmethod
+    def append(
+        points: dict[str, list],
+        window: int | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> UiwizJSONResponse:
+        """Append points to named series of the chart targeted by the request.
+
+        Only the new points are sent, the chart keeps the points it already has.
+
+        .. code-block:: python
+
+                @app.post("/cpu")
+                def cpu():
+                    return ui.echart.append({"CPU": [[time.time() * 1000, psutil.cpu_percent()]]}, window=600)
+
+        :param points: the new points by the name of the series
+        :param window: the number of points a series keeps, the oldest are dropped
+        :param headers: extra headers of the response
+        """
+        return UiwizJSONResponse({"append": points, "window": window}, headers=headers)
+
+    @staticmethod
+    def stream(
+        updates: AsyncIterable[dict[str, list]],
+        window: int | None = None,
+        heartbeat: float | None = HEARTBEAT_INTERVAL,
+    ) -> StreamingResponse:
+        """Stream points to append to named series as Server-Sent Events.
+
+        Return the response from a GET route and pass its path as ``stream`` to :class:`EChart`.
+        When ``updates`` ends a ``close`` event is sent, the chart stops listening instead of
+        reconnecting and appending the same points again.
+
+        .. code-block:: python
+
+                @app.get("/cpu/stream")
+                async def cpu_stream():
+                    async def updates():
+                        while True:
+                            yield {"CPU": [[time.time() * 1000, psutil.cpu_percent()]]}
+                            await asyncio.sleep(1)
+
+                    return ui.echart.stream(updates(), window=600)
+
+        :param updates: yields the new points by the name of the series
+        :param window: the number of points a series keeps, the oldest are dropped
+        :param heartbeat: seconds without points before a heartbeat is sent to keep the connection
+            open, None disables it
+        """
+
+        async def messages() -> AsyncGenerator[bytes, None]:
+            try:
+                async for points in updates:
+                    yield format_event(dumps({"append": points, "window": window}))
+            finally:
+                if hasattr(updates, "aclose"):
+                    await updates.aclose()
+
+        return StreamingResponse(
+            event_stream(messages(), heartbeat),
+            media_type=EVENT_STREAM_MEDIA_TYPE,
+            headers=EVENT_STREAM_HEADERS,
+        )
@@ -5,6 +5,8 @@ from uiwiz.event import ON_EVENTS, SWAP_EVENTS
 
 
 class Bindable(Element):
+    __slots__ = ()
+
     def bind_text_from(
         self,
         element: Element,
@@ -9,6 +9,8 @@ if TYPE_CHECKING:
 
 
 class OnEvent(Element):
+    __slots__ = ()
+
     def on(
         self,
         trigger: ON_EVENTS,
@@ -2,6 +2,7 @@ from uiwiz.element import Element
 
 
 class Footer(Element):
+    __slots__ = ()
     root_class: str = "mt-auto "
     _classes: str = "items-center p-4 bg-neutral text-neutral-content"
 
@@ -9,6 +9,7 @@ if TYPE_CHECKING:
 
 
 class Form(Element):
+    __slots__ = ()
     root_class: str = "flex flex-col items-start gap-4 p-4 "
 
     def __init__(self) -> None:
@@ -2,6 +2,7 @@ from uiwiz.element import Element
 
 
 class FullWidth(Element):
+    __slots__ = ()
     root_class = "w-full"
 
     def __init__(self) -> None:
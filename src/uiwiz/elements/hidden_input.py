@@ -6,6 +6,7 @@ from uiwiz.element import Element
 
 
 class HiddenInput(Element):
+    __slots__ = ()
     _classes: str = ""
 
     def __init__(
@@ -2,6 +2,8 @@ from uiwiz.element import Element
 
 
 class Html(Element):
+    __slots__ = ()
+
     def __init__(self, content: str) -> None:
         """Html element
 
@@ -5,6 +5,7 @@ from uiwiz.elements.extensions.on_event import OnEvent
 
 
 class Input(OnEvent):
+    __slots__ = ("label_text",)
     root_class: str = "input "
     root_size: str = "input-{size}"
     _classes: str = "input-bordered w-full"
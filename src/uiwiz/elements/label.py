@@ -5,6 +5,7 @@ from uiwiz.elements.extensions.bindable import Bindable
 
 
 class Label(Bindable):
+    __slots__ = ("_for",)
     root_class: str = "label "
     root_size: str = "label-{size}"
 
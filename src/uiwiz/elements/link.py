@@ -6,6 +6,7 @@ from uiwiz.element import Element
 
 
 class Link(Element):
+    __slots__ = ("link",)
     root_class: str = "link "
     _classes: str = "link-hover"
 
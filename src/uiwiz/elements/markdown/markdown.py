@@ -12,6 +12,8 @@ CODE_HIGHLIGHT = Path(__file__).parent / "codehighlight.css"
 
 
 class Markdown(Element, extensions=[MARKDOWN, CODE_HIGHLIGHT]):
+    __slots__ = ("extras", "markdown")
+
     def __init__(self, content: str = "", extras: list[str] | None = None) -> None:
         """Markdown
 
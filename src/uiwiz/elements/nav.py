@@ -2,6 +2,7 @@ from uiwiz.element import Element
 
 
 class Nav(Element):
+    __slots__ = ()
     root_class: str = "navbar w-full gap-4"
     root_size: str = "navbar-{size}"
 
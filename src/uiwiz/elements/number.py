@@ -4,6 +4,7 @@ from uiwiz.elements.extensions.on_event import OnEvent
 
 
 class Number(OnEvent):
+    __slots__ = ()
     root_class: str = "input "
 
     def __init__(
@@ -2,6 +2,7 @@ from uiwiz.elements.extensions.on_event import OnEvent
 
 
 class Radio(OnEvent):
+    __slots__ = ()
     root_class: str = "radio"
     root_size: str = "radio-{size}"
 
@@ -4,6 +4,7 @@ from uiwiz.elements.extensions.on_event import OnEvent
 
 
 class Range(OnEvent):
+    __slots__ = ()
     root_class: str = "range "
     root_size: str = "range-{size}"
 
@@ -2,6 +2,7 @@ from uiwiz.element import Element
 
 
 class Row(Element):
+    __slots__ = ("__root_class__",)
     root_class: str = "flex flex-row {wrap} {item_position} {gap} {padding}"
 
     def __init__(
@@ -6,6 +6,7 @@ from uiwiz.element import Element
 
 
 class Spinner(Element):
+    __slots__ = ("_spinner_for", "type")
     _size: Literal["xs", "sm", "md", "lg"] = "sm"
     _type: Literal["spinner", "dots", "ring", "ball", "bars", "infinity"] = "infinity"
     root_class: str = "loading "
@@ -0,0 +1,25 @@
+const dataStreamName = "data-wz-stream";
+
+function connectStream(element) {
+    if (element._uiWizardStream)
+        return;
+    const source = new EventSource(getAttributeFromElement(element, dataStreamName));
+    const swapStyle = getAttributeFromElement(element, `${dataStreamName}-swap`) || "innerHTML";
+    element._uiWizardStream = source;
+    source.onmessage = (event) => {
+        // Stop the stream when the element is swapped out of the page
+        if (!document.body.contains(element)) {
+            source.close();
+            return;
+        }
+        htmx.swap(element, event.data, { swapStyle: swapStyle });
+    };
+    // Sent when the stream has ended, otherwise the browser reconnects
+    source.addEventListener("close", () => source.close());
+}
+
+htmx.onLoad((content) => {
+    if (content.matches && content.matches(`[${dataStreamName}]`))
+        connectStream(content);
+    content.querySelectorAll(`[${dataStreamName}]`).forEach(connectStream);
+});
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from uiwiz.element import Element
+
+JS_PATH = Path(__file__).parent / "stream.js"
+
+
+class Stream(Element, extensions=[JS_PATH]):
+    __slots__ = ()
+    name: str = "data-wz-stream"
+
+    def __init__(self, path: str, swap: str = "innerHTML") -> None:
+        """Stream element
+
+        Connects to an event stream registered with ``@app.stream(path)`` and swaps
+        every update it sends, the connection is closed when the element is removed.
+
+        .. code-block:: python
+            from uiwiz import ui
+
+            with ui.stream("/clock").classes("font-mono"):
+                ui.label("Waiting for the first update")
+
+        :param path: The path of the stream
+        :param swap: How an update is swapped into the element, e.g. ``beforeend`` to
+            append the updates or ``none`` when the updates are only out of band swaps
+        """
+        super().__init__()
+        self.attributes[Stream.name] = path
+        self.attributes[f"{Stream.name}-swap"] = swap
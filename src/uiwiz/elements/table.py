@@ -1,12 +1,19 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Callable, Optional, get_type_hints
+import sys
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Callable, NamedTuple, Optional, get_type_hints
+from uuid import uuid4
 
 from pydantic import BaseModel
 
-from uiwiz.element import Element
+from uiwiz.element import Element, Markup
 from uiwiz.elements.button import Button
+from uiwiz.elements.spinner import Spinner
+from uiwiz.elements.toast import Toast
+from uiwiz.frame import Frame
 from uiwiz.models.model_handler import ModelForm
+from uiwiz.shared import SourceCache, route_exists
 
 if TYPE_CHECKING:
     import polars as pl
@@ -16,20 +23,80 @@ if TYPE_CHECKING:
     from uiwiz.event import FUNC_TYPE
 
 
+TABLE_DATA = Sequence[BaseModel] | Callable[[int, int], Sequence[BaseModel]]
+PAGE_ENDPOINT = "/_uiwiz/table/{token}/{offset}"
+MAX_SOURCES = 512
+
+
+class TableSource(NamedTuple):
+    data: TABLE_DATA
+    page_size: int
+    columns: int
+    id_column_name: str | None
+    edit: FUNC_TYPE | None
+    delete: FUNC_TYPE | None
+
+    def rows(self, offset: int, limit: int) -> Sequence[BaseModel]:
+        if callable(self.data):
+            return self.data(offset, limit)
+        return self.data[offset : offset + limit]
+
+
+def _source_size(source: TableSource) -> int:
+    # Rows fetched by a callable are not kept, a sequence is estimated from its first row
+    if callable(source.data) or not source.data:
+        return sys.getsizeof(source)
+    row = source.data[0]
+    return sys.getsizeof(source.data) + len(source.data) * sum(sys.getsizeof(value) for value in vars(row).values())
+
+
+# Sources of the paginated tables that are rendered, set ``table_sources.maxsize`` and
+# ``table_sources.max_bytes`` to change how many are kept
+table_sources: SourceCache[TableSource] = SourceCache(_source_size, maxsize=MAX_SOURCES)
+
+
+def _render_page(token: str, offset: int) -> None:
+    source = table_sources.get(token)
+    if source is None:
+        # Evicted, or rendered by another worker. The empty response removes the loading row
+        Toast("The table data is no longer available, reload the page to see more rows").error()
+        return
+    Table.render_rows(token, source, offset)
+
+
 class ModelFormRender(ModelForm):
+    __slots__ = ()
+
     def render_model(self, *args, **kwargs) -> Form:
         self.button = Button("Save")
         self.button.render_html = False
 
 
 class Table(Element):
+    __slots__ = (
+        "container",
+        "create",
+        "data",
+        "delete",
+        "did_render",
+        "edit",
+        "id_column_name",
+        "page_size",
+        "schema",
+        "source",
+    )
     root_size: str = "table-{size}"
     _classes_container: str = "w-full overflow-x-auto rounded-box "
     _classes_table: str = (
         "table table-zebra table-auto bg-base-300 overflow-scroll w-full whitespace-nowrap pr-4 pt-2 pb-2"
     )
 
-    def __init__(self, data: list[BaseModel], id_column_name: str | None = None) -> None:
+    def __init__(
+        self,
+        data: TABLE_DATA,
+        id_column_name: str | None = None,
+        page_size: int | None = None,
+    ) -> None:
         """Creates a table from a list of pydantic models
 
         Example:
@@ -48,16 +115,40 @@ class Table(Element):
             ]
             ui.table(data, id_column_name="id")
 
-        :param data: A list of pydantic models
+        With ``page_size`` only the first rows are rendered with the page. The next rows are
+        fetched when the end of the table is scrolled into view, so large tables render as
+        fast as small ones. ``data`` can also be a function returning the rows of a slice,
+        e.g. a database query with offset and limit.
+
+        .. code-block:: python
+            def users(offset: int, limit: int) -> list[User]:
+                return db.query(User).offset(offset).limit(limit).all()
+
+            ui.table(users, page_size=100)
+
+        The source of the next rows is kept in the memory of the worker that rendered the table,
+        the least recently used sources are dropped (see ``table_sources``). When more than one
+        worker runs, the requests of a client must be routed to the same worker.
+
+        :param data: A list of pydantic models, or a function of offset and limit returning them
         :param id_column_name: The name of the Pydantic attribute to be used with the path param endpoint. An endpoint like /path/{id} should have a attribute "id" on the class
+        :param page_size: The number of rows to render per request, all rows are rendered when not set
         :return: The current instance of the element.
 
         """
+        if callable(data) and page_size is None:
+            raise ValueError("page_size is required when data is a function")
         container = Element("div").classes("w-full")
         with container:
             super().__init__()
         self.classes(Table._classes_container)
 
+        self.page_size = page_size
+        self.source = data
+        if callable(data):
+            # Fetch one extra row to know if there is a next page
+            data = data(0, page_size + 1)
+
         self.schema = []
         if data:
             self.schema = list(data[0].__class__.model_fields.keys())
@@ -229,13 +320,60 @@ class Table(Element):
                     Element("th")
             # rows
             with Element("tbody") as container:
-                for row in self.data:
-                    self.render_row(row, self.id_column_name, self.edit, self.delete)
+                if self.page_size is None:
+                    for row in self.data:
+                        self.render_row(row, self.id_column_name, self.edit, self.delete)
+                else:
+                    source = TableSource(
+                        data=self.source,
+                        page_size=self.page_size,
+                        columns=len(self.schema) + bool(self.edit or self.delete),
+                        id_column_name=self.id_column_name,
+                        edit=self.edit,
+                        delete=self.delete,
+                    )
+                    # Functions get the same token on every render, lists are specific to the request
+                    token = f"{hash(source) & sys.maxsize:x}" if callable(self.source) else uuid4().hex
+                    Table.render_rows(token, source, 0, self.data[: self.page_size + 1])
         if self.create:
             with self.container, Element().classes("pt-2 pb-2"):
                 Button("Add").on_click(self.create, container, swap="beforeend")
         self.did_render = True
 
+    @classmethod
+    def render_rows(
+        cls,
+        token: str,
+        source: TableSource,
+        offset: int,
+        rows: Sequence[BaseModel] | None = None,
+    ) -> None:
+        """Render a page of rows, followed by a row loading the next page when it is revealed
+
+        :param token: The key of the source in ``table_sources``
+        :param source: The source of the rows
+        :param offset: The index of the first row
+        :param rows: The rows from offset, fetched from the source when not given
+        """
+        if rows is None:
+            rows = source.rows(offset, source.page_size + 1)
+        for row in rows[: source.page_size]:
+            cls.render_row(row, source.id_column_name, source.edit, source.delete)
+        if len(rows) <= source.page_size:
+            return
+
+        table_sources.set(token, source)
+        if not route_exists(PAGE_ENDPOINT):
+            Frame.get_stack().app.ui(PAGE_ENDPOINT, include_js=False, include_css=False)(_render_page)
+        with Element("tr") as loader:
+            loader.event = {
+                "func": PAGE_ENDPOINT.format(token=token, offset=offset + source.page_size),
+                "trigger": "revealed",
+                "swap": "outerHTML",
+            }
+            with Element("td", colspan=source.columns).classes("text-center"):
+                Spinner()
+
     @classmethod
     def render_row(
         cls,
@@ -298,11 +436,13 @@ class Table(Element):
     def from_dataframe(cls, df: pl.DataFrame) -> Element:
         """Render a polars.DataFrame
 
+        The rows are rendered to html by polars in one pass, without an element per cell.
+        Values are formatted by polars, except booleans and nulls which render as
+        ``True``/``False`` and ``None``.
+
         :param df: The DataFrame to render
         :return: The container element
         """
-        df = df.fill_null("None")
-
         with Element().classes(Table._classes_container) as container:
             with Element("table").classes(Table._classes_table):
                 # columns
@@ -310,9 +450,54 @@ class Table(Element):
                     for col in df.columns:
                         Element("th", content=col)
                 # rows
-                with Element("tbody"):
-                    for row in df.iter_rows():
-                        with Element("tr"):
-                            for val in row:
-                                Element("td", content=val)
+                with Element("tbody") as tbody:
+                    tbody.children.append(Markup(dataframe_rows(df)))
         return container
+
+
+def _cell_text(name: str, dtype: pl.DataType) -> pl.Expr:
+    import polars as pl
+
+    col = pl.col(name)
+    if dtype.is_numeric() or dtype.is_temporal():
+        # Numbers and dates do not contain characters that need escaping
+        return col.cast(pl.String).fill_null("None")
+    if dtype == pl.Boolean:
+        return pl.when(col).then(pl.lit("True")).when(col.not_()).then(pl.lit("False")).otherwise(pl.lit("None"))
+    if dtype.is_nested() or dtype in {pl.Object, pl.Binary}:
+        # No native string cast for these, format the python values like the cells of a table
+        text = col.map_batches(
+            lambda series: pl.Series(
+                [None if value is None else str(value) for value in series.to_list()], dtype=pl.String
+            ),
+            return_dtype=pl.String,
+        )
+    else:
+        text = col.cast(pl.String)
+    text = text.fill_null("None")
+    for char, entity in _HTML_ESCAPES:
+        text = text.str.replace_all(char, entity, literal=True)
+    return text
+
+
+# Same replacements as html.escape, & first
+_HTML_ESCAPES = (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"), ('"', "&quot;"), ("'", "&#x27;"))
+
+
+def dataframe_rows(df: pl.DataFrame) -> str:
+    """Render the rows of a DataFrame as ``<tr>`` html
+
+    :param df: The DataFrame to render
+    :return: The html of all rows, empty when the DataFrame has no rows or columns
+    """
+    import polars as pl
+
+    if df.height == 0 or df.width == 0:
+        return ""
+    parts: list[pl.Expr] = [pl.lit("<tr><td>")]
+    for index, (name, dtype) in enumerate(df.schema.items()):
+        if index:
+            parts.append(pl.lit("</td><td>"))
+        parts.append(_cell_text(name, dtype))
+    parts.append(pl.lit("</td></tr>"))
+    return df.select(pl.concat_str(parts).str.join("")).item()
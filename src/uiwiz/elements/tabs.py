@@ -4,6 +4,7 @@ from uiwiz.element import Element
 
 
 class Tabs(Element):
+    __slots__ = ()
     root_class: str = "tabs "
     _classes: str = "tabs-box"
 
@@ -46,6 +47,7 @@ class Tabs(Element):
 
 
 class Tab(Element):
+    __slots__ = ("selector",)
     _classes: str = "tab"
 
     def __init__(self, title: str, active: bool | None = None) -> None:
@@ -4,6 +4,7 @@ from uiwiz.elements.extensions.on_event import OnEvent
 
 
 class TextArea(OnEvent):
+    __slots__ = ()
     root_class: str = "textarea "
     root_size: str = "textarea-{size}"
     _classes: str = "textarea-bordered w-full"
@@ -42,6 +42,8 @@ THEMES = Literal[
 
 
 class ThemeSelector(Element):
+    __slots__ = ("theme_selector", "themes")
+
     def __init__(self, themes: Optional[THEMES] = None) -> None:
         """Theme Selector
         A dropdown to select a theme for the application.
@@ -1,13 +1,13 @@
 from __future__ import annotations
 
-import json
-
 from uiwiz import ui
 from uiwiz.element import Element
+from uiwiz.serialization import dumps_attribute
 from uiwiz.svg.svg_handler import _type, get_svg
 
 
 class Toast(Element):
+    __slots__ = ("_auto_close", "_svg", "context_manager_used", "inner_class", "inner_element", "message")
     root_class: str = "alert w-full z-50 outline "
 
     def __init__(self, message: str = "", svg: _type = None) -> None:
@@ -66,7 +66,11 @@ class Toast(Element):
                     self.inner_element.children.remove(svg)
                     self.inner_element.children.insert(0, svg)
                 Element("span", content=self.message)
-                self.inner_element.attributes["hx-toast-data"] = json.dumps({"autoClose": self._auto_close})
+                self.inner_element.attributes.__setitem__(
+                    "hx-toast-data",
+                    dumps_attribute({"autoClose": self._auto_close}),
+                    False,
+                )
                 btn = None
                 self.inner_element.attributes["hx-toast-delete-button"] = lambda: btn.id if btn else ""
                 if not self._auto_close:
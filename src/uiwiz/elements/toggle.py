@@ -2,6 +2,7 @@ from uiwiz.elements.extensions.on_event import OnEvent
 
 
 class Toggle(OnEvent):
+    __slots__ = ()
     root_class: str = "toggle"
     root_size: str = "toggle-{size}"
 
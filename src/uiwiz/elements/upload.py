@@ -3,6 +3,7 @@ from uiwiz.event import FUNC_TYPE, ON_EVENTS, SWAP_EVENTS, TARGET_TYPE
 
 
 class Upload(OnEvent):
+    __slots__ = ()
     root_class: str = "file-input"
     root_size: str = "file-input-{size}"
     _classes: str = "file-input-bordered"
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import functools
+import inspect
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterator
+from contextlib import contextmanager
+from typing import Any, NamedTuple
+from uuid import uuid4
+from weakref import WeakKeyDictionary
+
+from uiwiz.element import Element, Markup
+from uiwiz.frame import Frame
+
+logger = logging.getLogger("uiwiz")
+
+# The number of times each fragment, by id prefix, has been inserted in a frame
+_inserts: WeakKeyDictionary[Frame, dict[str, int]] = WeakKeyDictionary()
+# Returned as the key of calls that can not be cached
+_UNCACHED = object()
+
+
+class CachedFragment(NamedTuple):
+    prefix: str
+    html: str
+    scripts: tuple[str, ...]
+    extensions: tuple[str, ...]
+    expires: float | None
+
+
+class FragmentCache:
+    def __init__(self, maxsize: int = 256) -> None:
+        """Store rendered html fragments with least recently used eviction.
+
+        :param maxsize: the number of fragments to keep
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._fragments: OrderedDict[Hashable, CachedFragment] = OrderedDict()
+
+    def get(self, key: Hashable) -> CachedFragment | None:
+        fragment = self._fragments.get(key)
+        if fragment is not None and fragment.expires is not None and fragment.expires <= time.monotonic():
+            del self._fragments[key]
+            fragment = None
+        if fragment is None:
+            self.misses += 1
+            return None
+        self._fragments.move_to_end(key)
+        self.hits += 1
+        return fragment
+
+    def set(self, key: Hashable, fragment: CachedFragment) -> None:
+        self._fragments[key] = fragment
+        self._fragments.move_to_end(key)
+        while len(self._fragments) > self.maxsize:
+            self._fragments.popitem(last=False)
+
+    def invalidate(self, key: Hashable | None = None) -> None:
+        """Remove a fragment, or all fragments when no key is given."""
+        if key is None:
+            self._fragments.clear()
+        else:
+            self._fragments.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._fragments)
+
+
+fragment_cache = FragmentCache()
+
+
+class _FragmentNode(Markup):
+    """A cached fragment in the element tree, contributes the scripts of its elements when rendered."""
+
+    __slots__ = ("scripts", "stack")
+
+    def __init__(self, fragment: CachedFragment, stack: Frame) -> None:
+        super().__init__(fragment.html)
+        self.scripts = fragment.scripts
+        self.stack = stack
+
+    def render(self, render_script: bool = True) -> str:
+        html = self.__render_self__()
+        if render_script:
+            html += "".join(Element.__render_script__(script) for script in self.stack.scripts)
+        return html
+
+    def __render_self__(self) -> str:
+        self.stack.scripts.extend(self.scripts)
+        return self.html
+
+    def __render_iter__(self) -> Iterator[str]:
+        yield self.__render_self__()
+
+    def __set_frame__(self, frame: Frame) -> None:
+        self.stack = frame
+
+
+def _siblings(frame: Frame) -> list[Element | Markup]:
+    parent = frame.current_element
+    return frame.root if parent is None else parent.children
+
+
+@contextmanager
+def _capture_extensions(frame: Frame) -> Iterator[None]:
+    """Collect the extensions added inside the block from an empty list.
+
+    The page may already have the extensions of the fragment, other pages the fragment
+    is inserted in need them as well.
+    """
+    page_extensions, frame.extensions = frame.extensions, []
+    try:
+        yield
+    finally:
+        captured, frame.extensions = frame.extensions, page_extensions
+        for extension in captured:
+            if extension not in page_extensions:
+                page_extensions.append(extension)
+
+
+def _capture(
+    frame: Frame,
+    siblings: list[Element | Markup],
+    start: int,
+    prefix: str,
+    ttl: float | None,
+) -> CachedFragment:
+    """Render the elements added since ``start`` and replace them by a fragment node."""
+    scripts = len(frame.scripts)
+    nodes = siblings[start:]
+    del siblings[start:]
+    html = "".join(node.__render_self__() for node in nodes if node.oob is False)
+    fragment = CachedFragment(
+        prefix=prefix,
+        html=html,
+        scripts=tuple(frame.scripts[scripts:]),
+        extensions=tuple(frame.extensions),
+        expires=None if ttl is None else time.monotonic() + ttl,
+    )
+    del frame.scripts[scripts:]
+    return fragment
+
+
+def _emit(frame: Frame, fragment: CachedFragment) -> None:
+    for extension in fragment.extensions:
+        if extension not in frame.extensions:
+            frame.extensions.append(extension)
+    # The same fragment inserted again in a page gets ids of its own
+    inserts = _inserts.setdefault(frame, {})
+    count = inserts[fragment.prefix] = inserts.get(fragment.prefix, 0) + 1
+    if count > 1:
+        prefix = f"{fragment.prefix[:-1]}r{count}-"
+        fragment = fragment._replace(
+            html=fragment.html.replace(fragment.prefix, prefix),
+            scripts=tuple(script.replace(fragment.prefix, prefix) for script in fragment.scripts),
+        )
+    _siblings(frame).append(_FragmentNode(fragment, frame))
+
+
+def cached_fragment(
+    key: Hashable | Callable[..., Hashable] | None = None,
+    ttl: float | None = None,
+    cache: FragmentCache | None = None,
+) -> Callable[[Callable], Callable]:
+    """Cache the html of the elements created by a function.
+
+    The first call runs the function and renders its elements once. Later calls skip
+    the function and insert the cached html where the elements would have been created.
+    Extensions and scripts of the cached elements are still added to the page.
+
+    Elements of a fragment get ids from their own prefix, so they do not clash with
+    the ids of the page. When a fragment is inserted more than once in a page every
+    copy gets its own ids. The html is a snapshot of the elements when the function
+    returns, out of band elements are not part of the fragment.
+
+    .. code-block:: python
+        from uiwiz import ui
+
+        @ui.cached_fragment(key="nav", ttl=600)
+        def nav():
+            with ui.nav():
+                ui.link("Home", "/")
+
+    :param key: the cache key, or a function of the arguments returning the key.
+        Defaults to the function and its arguments. Calls with arguments that can not be
+        hashed, e.g. a list or a DataFrame, are rendered without the cache unless a key
+        function is given
+    :param ttl: seconds before the fragment is rendered again, defaults to no expiry
+    :param cache: the cache to store the fragments in, defaults to a shared cache
+    """
+    store = fragment_cache if cache is None else cache
+
+    def decorator(func: Callable) -> Callable:
+        warned = False
+
+        def cache_key(args: tuple, kwargs: dict[str, Any]) -> Hashable:
+            nonlocal warned
+            if key is None:
+                fragment_key = (func.__module__, func.__qualname__, args, tuple(sorted(kwargs.items())))
+            elif callable(key):
+                fragment_key = key(*args, **kwargs)
+            else:
+                return key
+            try:
+                hash(fragment_key)
+            except TypeError:
+                if not warned:
+                    warned = True
+                    logger.warning(
+                        "Fragment %s has arguments that can not be hashed, it is rendered without the cache. "
+                        "Pass a key function to cached_fragment to cache it",
+                        func.__qualname__,
+                    )
+                return _UNCACHED
+            return fragment_key
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> None:
+                frame = Frame.get_stack()
+                fragment_key = cache_key(args, kwargs)
+                if fragment_key is _UNCACHED:
+                    await func(*args, **kwargs)
+                    return
+                if (fragment := store.get(fragment_key)) is None:
+                    siblings, start, prefix = _siblings(frame), len(_siblings(frame)), f"c{uuid4().hex[:10]}-"
+                    with frame.id_scope(prefix), _capture_extensions(frame):
+                        await func(*args, **kwargs)
+                        fragment = _capture(frame, siblings, start, prefix, ttl)
+                    store.set(fragment_key, fragment)
+                _emit(frame, fragment)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> None:
+            frame = Frame.get_stack()
+            fragment_key = cache_key(args, kwargs)
+            if fragment_key is _UNCACHED:
+                func(*args, **kwargs)
+                return
+            if (fragment := store.get(fragment_key)) is None:
+                siblings, start, prefix = _siblings(frame), len(_siblings(frame)), f"c{uuid4().hex[:10]}-"
+                with frame.id_scope(prefix), _capture_extensions(frame):
+                    func(*args, **kwargs)
+                    fragment = _capture(frame, siblings, start, prefix, ttl)
+                store.set(fragment_key, fragment)
+            _emit(frame, fragment)
+
+        return wrapper
+
+    return decorator
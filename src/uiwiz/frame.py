@@ -1,29 +1,27 @@
 from __future__ import annotations
 
-import asyncio
 import os
-from collections.abc import Iterable
+import threading
+from collections.abc import AsyncIterator, Iterable, Iterator
+from contextlib import contextmanager
 from typing import TYPE_CHECKING
 from uuid import uuid4
 
-from uiwiz.middleware.asgi_request_middleware import get_request
+from uiwiz.middleware.asgi_request_middleware import _frame_ctx_var, _request_frames_ctx_var, get_request
 from uiwiz.version import __version__
 
+STREAM_CHUNK_SIZE = 16 * 1024
+
 if TYPE_CHECKING:
     from pathlib import Path
 
     from uiwiz.element import Element
 
 
-def get_task_id() -> int:
-    try:
-        return id(asyncio.current_task())
-    except RuntimeError:
-        return 0
-
-
 class Frame:
-    stacks: dict[int, Frame] = {}
+    _live_frames: int = 0
+    # Frames of sync routes are created and released in threadpool workers
+    _live_frames_lock = threading.Lock()
 
     def __init__(self) -> None:
         self.root: list[Element] = []
@@ -31,30 +29,139 @@ class Frame:
         self.id_count: int = 0  # used for element id
         self.scripts: list[str] = []
         self.extensions: list[str] = []
+        self.drained_extensions: int = 0
         self.app = get_request().app
-        self.last_id = None
         self.meta_description_content: str = ""
+        self._id_prefix: str | None = None
+        self._target_id: str | None = None
+        self.released: bool = False
+        with Frame._live_frames_lock:
+            Frame._live_frames += 1
 
     def get_id(self) -> str:
+        if self._id_prefix is None:
+            self.__read_swap_headers__()
+
+        if self._target_id is not None:
+            # The first element of an outerHTML swap replaces the target, so it keeps its id
+            target_id, self._target_id = self._target_id, None
+            return target_id
+
+        return f"{self._id_prefix}{self.id_count}"
+
+    @property
+    def id_prefix(self) -> str | None:
+        """The prefix of the element ids, None until the first id is allocated."""
+        return self._id_prefix
+
+    def __read_swap_headers__(self) -> None:
+        """Set up id allocation from the htmx headers of the request.
+
+        Full page loads use ``a-{count}``. Partial swaps are inserted into a page
+        that already has those ids, so they get a random prefix per frame.
+        """
         headers = get_request().headers
         swap = headers.get("hx-swap")
-
         if swap is None:
-            return f"a-{self.id_count}"
+            self._id_prefix = "a-"
+            return
 
-        target_id = self.last_id if self.last_id else headers.get("hx-target")
-        if swap.lower() in ["outerhtml", "this"] and self.last_id != target_id:
-            self.last_id = target_id
-        else:
-            self.last_id = "a" + str(uuid4())
+        self._id_prefix = f"a{uuid4().hex[:12]}-"
+        if swap.lower() in {"outerhtml", "this"}:
+            self._target_id = headers.get("hx-target")
 
-        return self.last_id
+    @contextmanager
+    def id_scope(self, prefix: str) -> Iterator[None]:
+        """Allocate element ids from a separate prefix and counter inside the block.
+
+        :param prefix: the prefix of the ids, e.g. ``c1-``
+        """
+        saved = self._id_prefix, self.id_count, self._target_id
+        self._id_prefix, self.id_count, self._target_id = prefix, 0, None
+        try:
+            yield
+        finally:
+            self._id_prefix, self.id_count, self._target_id = saved
 
     def render(self) -> str:
         content = "".join([el.render() for el in self.root])
         self.del_stack()
         return content
 
+    async def render_stream(self, chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[str]:
+        """Render the frame as a stream of HTML chunks.
+
+        Output is buffered up to ``chunk_size`` characters, and flushed early once
+        the ``<head>`` has been rendered so the browser can start fetching css and
+        scripts while the body is still being serialized.
+
+        The response body may be iterated in its own task, so the frame is bound to
+        the context of that task while rendering and released when the stream ends.
+        """
+        from uiwiz.element import FLUSH, Element  # noqa: PLC0415
+
+        _frame_ctx_var.set(self)
+        try:
+            buffer: list[str] = []
+            size = 0
+            for el in self.root:
+                chunks = el.render_iter() if isinstance(el, Element) else [el.render()]
+                for chunk in chunks:
+                    if chunk is not FLUSH:
+                        buffer.append(chunk)
+                        size += len(chunk)
+                        if size < chunk_size:
+                            continue
+                    if buffer:
+                        yield "".join(buffer)
+                        buffer.clear()
+                        size = 0
+            if buffer:
+                yield "".join(buffer)
+        finally:
+            self.release()
+
+    def drain(self) -> str:
+        """Render the elements added since the last drain and remove them from the frame.
+
+        Used by event streams, the frame lives as long as the connection but only holds
+        the elements of the update that is being rendered. The css and js of extensions
+        first used in the update are added to the head of the page out of band, so they
+        are kept when the next update replaces the content.
+        """
+        from uiwiz.element import Element  # noqa: PLC0415
+
+        html = ""
+        if extensions := self.extensions[self.drained_extensions :]:
+            self.drained_extensions = len(self.extensions)
+            assets = "".join(
+                f'<link href="{lib}" rel="stylesheet" type="text/css">'
+                if lib.endswith("css")
+                else f'<script src="{lib}" type="module"></script>'
+                for lib in extensions
+            )
+            html += f'<div hx-swap-oob="beforeend:head">{assets}</div>'
+        html += "".join(el.__render_self__() for el in self.root)
+        html += "".join(Element.__render_script__(script) for script in self.scripts)
+        self.root.clear()
+        self.scripts.clear()
+        self.current_element = None
+        return html
+
+    def release(self) -> None:
+        """Release the element tree of the frame.
+
+        Called when the response has been rendered, or by the request middleware
+        when the response ends. Releasing a frame more than once is a no-op.
+        """
+        with Frame._live_frames_lock:
+            if self.released:
+                return
+            self.released = True
+            Frame._live_frames -= 1
+        self.root.clear()
+        self.current_element = None
+
     def add_extension(self, cls: object, extensions: list[Path] | Path | None) -> None:
         if extensions is None:
             return
@@ -70,14 +177,31 @@ class Frame:
 
     @classmethod
     def get_stack(cls) -> Frame:
-        _id = get_task_id()
-        if _id not in cls.stacks:
-            cls.stacks[_id] = Frame()
-        return cls.stacks[_id]
+        frame = _frame_ctx_var.get()
+        if frame is None:
+            frame = Frame()
+            _frame_ctx_var.set(frame)
+            # Released by the request middleware when the response ends
+            frames = _request_frames_ctx_var.get()
+            if frames is not None:
+                frames.append(frame)
+        return frame
 
     @classmethod
     def del_stack(cls) -> None:
-        del cls.stacks[get_task_id()]
+        frame = _frame_ctx_var.get()
+        if frame is not None:
+            frame.release()
+            _frame_ctx_var.set(None)
+
+    @classmethod
+    def live_frames(cls) -> int:
+        """Get the number of frames that have been created but not released.
+
+        Frames are released at the end of each request, so a count that keeps
+        growing under load points to frames, and their element trees, being leaked.
+        """
+        return cls._live_frames
 
     @classmethod
     def set_meta_description_content(cls, content: str) -> None:
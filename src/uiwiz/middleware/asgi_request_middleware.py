@@ -1,16 +1,49 @@
+from __future__ import annotations
+
 from contextvars import ContextVar
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from starlette.requests import Request
 from starlette.types import ASGIApp, Receive, Scope, Send
 
+if TYPE_CHECKING:
+    from uiwiz.frame import Frame
+
 REQUEST_CTX_KEY = "_request"
+FRAME_CTX_KEY = "_frame"
+REQUEST_FRAMES_CTX_KEY = "_request_frames"
+
+_request_ctx_var: ContextVar[Request | LazyRequest | None] = ContextVar(REQUEST_CTX_KEY, default=None)
+_frame_ctx_var: ContextVar[Frame | None] = ContextVar(FRAME_CTX_KEY, default=None)
+# The frames created while handling a request. Sync endpoints and dependencies run in a copy of
+# the context, the frame they set is not visible to the middleware but the list is shared.
+_request_frames_ctx_var: ContextVar[list[Frame] | None] = ContextVar(REQUEST_FRAMES_CTX_KEY, default=None)
+
+
+class LazyRequest:
+    """Holds the scope of the current request and builds the starlette Request on first access.
+
+    Most requests, e.g. static files, never call get_request.
+    """
+
+    __slots__ = ("_request", "scope")
+
+    def __init__(self, scope: Scope) -> None:
+        self.scope = scope
+        self._request: Request | None = None
 
-_request_ctx_var: ContextVar[dict[str, Request]] = ContextVar(REQUEST_CTX_KEY, default=None)
+    @property
+    def request(self) -> Request:
+        if self._request is None:
+            self._request = Request(self.scope)
+        return self._request
 
 
 def get_request() -> Request:
-    return _request_ctx_var.get()
+    request = _request_ctx_var.get()
+    if isinstance(request, LazyRequest):
+        return request.request
+    return request
 
 
 class AsgiRequestMiddleware:
@@ -18,8 +51,19 @@ class AsgiRequestMiddleware:
         self.app = app
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> Any:
-        if scope["type"] == "http":
-            request = Request(scope)
-            _request_ctx_var.set(request)
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
 
-        await self.app(scope, receive, send)
+        _request_ctx_var.set(LazyRequest(scope))
+        token = _frame_ctx_var.set(None)
+        frames: list[Frame] = []
+        frames_token = _request_frames_ctx_var.set(frames)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            # The frames own the element trees of the request, release them even if the handler raised
+            for frame in frames:
+                frame.release()
+            _request_frames_ctx_var.reset(frames_token)
+            _frame_ctx_var.reset(token)
+        return None
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder, IdentityResponder
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class FlushingGZipResponder(GZipResponder):
+    """GZipResponder that flushes the compressor after every chunk of a streamed response.
+
+    Without the flush gzip keeps the chunks in its window, the client gets the page at the end.
+    """
+
+    def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        if not more_body:
+            return super().apply_compression(body, more_body=False)
+        self.gzip_file.write(body)
+        self.gzip_file.flush()
+        body = self.gzip_buffer.getvalue()
+        self.gzip_buffer.seek(0)
+        self.gzip_buffer.truncate()
+        return body
+
+
+class PathExcludedGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that leaves responses below the given path prefixes untouched.
+
+    Used for the static routes, which serve precompressed variants themselves.
+    Streamed responses are compressed chunk by chunk, so they still arrive incrementally.
+    """
+
+    def __init__(self, app: ASGIApp, exclude_prefixes: list[str], minimum_size: int = 500) -> None:
+        super().__init__(app, minimum_size=minimum_size)
+        self.exclude_prefixes = tuple(exclude_prefixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.exclude_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        if "gzip" in Headers(scope=scope).get("Accept-Encoding", ""):
+            responder = FlushingGZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size)
+        await responder(scope, receive, send)
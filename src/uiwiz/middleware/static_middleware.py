@@ -1,29 +1,100 @@
+from __future__ import annotations
+
 from typing import Any
 
-from starlette.datastructures import MutableHeaders
-from starlette.requests import Request
-from starlette.types import Receive, Scope, Send
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class CachePolicies(dict[str, str]):
+    def __init__(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        """Cache-Control values keyed by path prefix, ``version`` is increased on every change.
+
+        Lets :class:`AsgiTtlMiddleware` notice prefixes added after it is built by comparing one integer.
+        """
+        super().__init__(*args, **kwargs)
+        self.version = 0
+
+    def _changed(self) -> None:
+        self.version += 1
+
+    def __setitem__(self, key: str, value: str) -> None:
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self._changed()
+
+    def setdefault(self, key: str, default: str) -> str:  # type: ignore[override]
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def pop(self, *args: Any) -> Any:  # noqa: ANN401
+        value = super().pop(*args)
+        self._changed()
+        return value
+
+    def popitem(self) -> tuple[str, str]:
+        item = super().popitem()
+        self._changed()
+        return item
+
+    def clear(self) -> None:
+        super().clear()
+        self._changed()
 
 
 class AsgiTtlMiddleware:
-    def __init__(self, app, cache_age: int) -> None:
+    def __init__(self, app: ASGIApp, cache_age: int, policies: dict[str, str] | None = None) -> None:
+        """Add a Cache-Control header to responses below the configured path prefixes.
+
+        Responses that already have a Cache-Control header and error responses are left untouched.
+
+        :param app: the asgi app
+        :param cache_age: max-age in seconds used when no policies are given, and for paths
+            containing ``static/`` that no policy matches
+        :param policies: Cache-Control values keyed by path prefix, the longest matching prefix is used.
+            Changes after the middleware is created are picked up when it is a :class:`CachePolicies`
+        """
         self.app = app
         self.cache_age = cache_age
+        self.default_policy = f"max-age={cache_age}".encode("latin-1")
+        if policies is None:
+            policies = {"/_static/": f"max-age={cache_age}"}
+        # Kept by reference, static folders can be added after the middleware is built
+        self.policies_source = policies if isinstance(policies, CachePolicies) else CachePolicies(policies)
+        self.policies_version = -1
+        self.policies: tuple[tuple[str, bytes], ...] = ()
+
+    def policy_for(self, path: str) -> bytes | None:
+        if self.policies_source.version != self.policies_version:
+            self.policies_version = self.policies_source.version
+            self.policies = tuple(
+                (prefix, policy.encode("latin-1"))
+                for prefix, policy in sorted(self.policies_source.items(), key=lambda item: len(item[0]), reverse=True)
+            )
+        for prefix, policy in self.policies:
+            if path.startswith(prefix):
+                return policy
+        # Static folders mounted without add_static_files keep the default max-age
+        if "static/" in path:
+            return self.default_policy
+        return None
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> Any:
-        if scope["type"] != "http":
+        if scope["type"] != "http" or (policy := self.policy_for(scope["path"])) is None:
             return await self.app(scope, receive, send)
 
-        async def send_with_extra_headers(message):
-            if message["type"] != "http.response.start":
-                await send(message)
-                return
-
-            request = Request(scope)
-            if "static/" in str(request.url):
-                headers = MutableHeaders(scope=message)
-                headers["Cache-Control"] = f"max-age={self.cache_age}"
-
+        async def send_with_cache_control(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:  # noqa: PLR2004
+                headers = message.get("headers", [])
+                if not any(name.lower() == b"cache-control" for name, _ in headers):
+                    message["headers"] = [*headers, (b"cache-control", policy)]
             await send(message)
 
-        await self.app(scope, receive, send_with_extra_headers)
+        return await self.app(scope, receive, send_with_cache_control)
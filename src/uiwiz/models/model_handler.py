@@ -44,6 +44,7 @@ switch = {
 
 
 class ModelForm(Form):
+    __slots__ = ("button", "card_classes", "compact", "instance", "label_classes", "model")
     model: BaseModel
     compact: bool
     button: Button
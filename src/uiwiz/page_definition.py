@@ -1,18 +1,60 @@
 from __future__ import annotations
 
 import inspect
-import json
 from collections.abc import Callable
+from functools import lru_cache
 from html import escape
 from typing import Annotated
 
 from fastapi import Depends, Request, Response
 
-from uiwiz.element import Element
+from uiwiz.element import Element, Markup
 from uiwiz.frame import Frame
+from uiwiz.serialization import dumps_attribute
 from uiwiz.version import __version__
 
 
+class _Title(Markup):
+    __slots__ = ()
+
+    @property
+    def content(self) -> str:
+        return self.html.removeprefix("<title>").removesuffix("</title>")
+
+    @content.setter
+    def content(self, content: str) -> None:
+        self.html = f"<title>{escape(str(content))}</title>"
+
+
+_DOCTYPE = Markup("<!DOCTYPE html>")
+_HEAD_META = Markup('<meta name="viewport" content="width=device-width, initial-scale=1"><meta charset="utf-8">')
+_EMPTY_DESCRIPTION = Markup('<meta description="">')
+_HEAD_LINKS = Markup(
+    f'<link href="/_static/{__version__}/libs/output.css" rel="stylesheet" type="text/css">'
+    f'<link href="/_static/{__version__}/libs/daisyui.css" rel="stylesheet" type="text/css">'
+    f'<link href="/_static/{__version__}/libs/daisyui-themes.css" rel="stylesheet" type="text/css">'
+    f'<script src="/_static/{__version__}/libs/tailwind.js"></script>'
+    f'<link href="/_static/{__version__}/app.css" rel="stylesheet" type="text/css">',
+)
+_SCRIPTS = Markup(
+    f'<script src="/_static/{__version__}/libs/htmx2.0.7.min.js"></script>'
+    f'<script src="/_static/{__version__}/libs/htmx-json-enc.js"></script>'
+    f'<script src="/_static/{__version__}/default.js"></script>',
+)
+
+
+@lru_cache(maxsize=64)
+def _toast(delay: int) -> Markup:
+    hx_toast_delay = dumps_attribute({"delay": delay})
+    return Markup(
+        f'<div id="toast" class="toast toast-top toast-end text-wrap z-50" hx-toast-delay="{hx_toast_delay}"></div>',
+    )
+
+
+def _overrides(page: PageDefinition, hook: str) -> bool:
+    return getattr(type(page), hook) is not getattr(PageDefinition, hook)
+
+
 class PageDefinition:
     html_ele: Element
     header_ele: Element
@@ -85,11 +127,7 @@ class PageDefinition:
         if cookie_theme := request.cookies.get("data-theme"):
             theme = escape(cookie_theme)
 
-        class RenderDoctype:
-            def render(self):
-                return "<!DOCTYPE html>"
-
-        frame.root.append(RenderDoctype())  # funky way to add doctype
+        frame.root.append(_DOCTYPE)
         page_title = request.app.title if title is None else title
         with Element("html").classes("overflow-y-scroll") as html:
             self.html_ele = html
@@ -102,31 +140,28 @@ class PageDefinition:
             with Element("head") as header:
                 self.header_ele = header
 
-                Element("meta", name="viewport").attributes["content"] = "width=device-width, initial-scale=1"
-                Element("meta", charset="utf-8")
-                Element("meta", description=frame.meta_description_content)
-
-                self._title_ele = Element("title", content=page_title)
-
-                Element("link", href=f"/_static/{__version__}/libs/output.css", rel="stylesheet", type="text/css")
-                Element("link", href=f"/_static/{__version__}/libs/daisyui.css", rel="stylesheet", type="text/css")
-                Element(
-                    "link",
-                    href=f"/_static/{__version__}/libs/daisyui-themes.css",
-                    rel="stylesheet",
-                    type="text/css",
+                description = frame.meta_description_content
+                self._title_ele = _Title("")
+                self._title_ele.content = page_title
+                header.children.extend(
+                    [
+                        _HEAD_META,
+                        Markup(f'<meta description="{escape(description)}">') if description else _EMPTY_DESCRIPTION,
+                        self._title_ele,
+                        _HEAD_LINKS,
+                    ],
                 )
-                Element("script", src=f"/_static/{__version__}/libs/tailwind.js")
-                Element("link", href=f"/_static/{__version__}/app.css", rel="stylesheet", type="text/css")
-                self.header(header)
+                if _overrides(self, "header"):
+                    self.header(header)
             with Element("body") as body:
                 self.body_ele = body
 
                 body.attributes["hx-ext"] = "swap-header"
-                self.body(body)
+                if _overrides(self, "body"):
+                    self.body(body)
                 with Element("div").classes("flex flex-col w-full min-h-screen") as content:
                     self.content_ele = content
-                    user_content = self.content(content)
+                    user_content = self.content(content) if _overrides(self, "content") else None
                     if user_content is not None:
                         if isinstance(user_content, Element):
                             self.content_ele = user_content
@@ -136,15 +171,12 @@ class PageDefinition:
                         result = user_method()
                         if inspect.isawaitable(result):
                             result = await result
-                        self.footer(content)
+                        if _overrides(self, "footer"):
+                            self.footer(content)
 
-                toast = Element("div").classes("toast toast-top toast-end text-wrap z-50")
-                toast.attributes["id"] = "toast"
-                toast.attributes["hx-toast-delay"] = json.dumps({"delay": request.app.toast_delay})
+                body.children.append(_toast(request.app.toast_delay))
 
-            Element("script", src=f"/_static/{__version__}/libs/htmx2.0.7.min.js")
-            Element("script", src=f"/_static/{__version__}/libs/htmx-json-enc.js")
-            Element("script", src=f"/_static/{__version__}/default.js")
+            html.children.append(_SCRIPTS)
 
         return result
 
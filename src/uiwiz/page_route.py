@@ -1,25 +1,60 @@
 from __future__ import annotations
 
 import functools
+import hashlib
 import inspect
 from functools import partial
 from typing import TYPE_CHECKING, Annotated, Any, TypedDict
 
 from fastapi import APIRouter, Request, Response, params
 from fastapi.datastructures import Default
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from fastapi.routing import APIRoute
 from typing_extensions import Doc
 
 from uiwiz.element import Element
 from uiwiz.frame import Frame
 from uiwiz.page_definition import PageDefinition
+from uiwiz.shared import etag_matches
+from uiwiz.sse import (
+    EVENT_STREAM_HEADERS,
+    EVENT_STREAM_MEDIA_TYPE,
+    HEARTBEAT_INTERVAL,
+    MAX_EVENT_SIZE,
+    stream_updates,
+)
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Sequence
 
     from starlette.types import ASGIApp, Lifespan
 
+    from uiwiz.response_cache import ResponseCache
+
+
+def _set_etag(response: Response, frame: Frame) -> None:
+    """Add a strong etag of the rendered html to the response.
+
+    Partial swaps get a random id prefix per request, it is left out of the hash so the
+    same content gets the same etag.
+    """
+    body = response.body
+    if frame.id_prefix not in {None, "a-"}:
+        body = body.replace(frame.id_prefix.encode(), b"a-")
+    response.headers["etag"] = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    # Let clients store the response but revalidate it on every use
+    response.headers["cache-control"] = "no-cache"
+
+
+def _not_modified(request: Request, response: Response) -> Response:
+    etag = response.headers.get("etag")
+    if etag is None or not etag_matches(request.headers.get("if-none-match"), etag):
+        return response
+    # htmx swaps the empty body of a 304, only plain browser GETs are revalidated
+    if request.method not in {"GET", "HEAD"} or "hx-request" in request.headers:
+        return response
+    return Response(status_code=304, headers={"etag": etag, "cache-control": response.headers["cache-control"]})
+
 
 class DecKwargs(TypedDict):
     page: PageDefinition
@@ -169,15 +204,47 @@ class PageRouter(APIRouter):
         page_definition_class: type[PageDefinition] | None = None,
         favicon: str | None = None,
         router: APIRouter | None = None,
+        stream: bool = False,
+        cache: ResponseCache | None = None,
+        etag: bool = False,
         **kwargs,
     ) -> Callable:
+        """Register a page, rendered as a full html document on GET requests.
+
+        :param path: The path of the page
+        :param title: The title of the page, defaults to the app title
+        :param page_definition_class: The page definition used to render the page
+        :param router: The router the route is added to, defaults to this router
+        :param stream: Stream the rendered html to the client in chunks instead of
+            sending it as one response. The ``<head>`` is sent as soon as it is rendered.
+        :param cache: Serve the rendered page from this cache, see :class:`ResponseCache`.
+            Streamed pages are not cached
+        :param etag: Send an etag of the rendered html and answer ``If-None-Match`` with
+            304 Not Modified when the html did not change. Not used for streamed pages,
+            htmx requests get the full page as a 304 would leave nothing to swap
+        """
+
         def decorator(func: Callable, *args, **kwargs) -> Callable:
             parameters_of_decorated_func = list(inspect.signature(func).parameters.keys())
             cap_title = title
             cap_page_definition_class = page_definition_class
+            cap_stream = stream
+            cap_cache = cache
+            cap_etag = etag
 
             @functools.wraps(func)
             async def decorated(*dec_args, **dec_kwargs: DecKwargs) -> Response:
+                if cap_cache is None:
+                    response = await render_page(*dec_args, **dec_kwargs)
+                else:
+                    response = await cap_cache.serve(
+                        dec_kwargs["request"],
+                        partial(render_page, *dec_args, **dec_kwargs),
+                        sub_response=dec_kwargs["response"],
+                    )
+                return _not_modified(dec_kwargs["request"], response) if cap_etag else response
+
+            async def render_page(*dec_args, **dec_kwargs: DecKwargs) -> Response:
                 Frame.get_stack().del_stack()
                 # Create frame before function is called
 
@@ -212,11 +279,22 @@ class PageRouter(APIRouter):
 
                 self.add_ext(page, include_js=True, include_css=True)
 
-                return HTMLResponse(
-                    content=Frame.get_stack().render(),
+                if cap_stream:
+                    return StreamingResponse(
+                        Frame.get_stack().render_stream(),
+                        status_code=200,
+                        media_type="text/html",
+                    )
+
+                frame = Frame.get_stack()
+                html_response = HTMLResponse(
+                    content=frame.render(),
                     status_code=200,
                     media_type="text/html",
                 )
+                if cap_etag:
+                    _set_etag(html_response, frame)
+                return html_response
 
             self.__ensure_request_response_signature__(decorated)
 
@@ -233,16 +311,29 @@ class PageRouter(APIRouter):
         *args,
         include_js: bool = False,
         include_css: bool = False,
+        cache: ResponseCache | None = None,
         **kwargs,
     ) -> Callable:
         def decorator(func: Callable) -> Callable:
             # Capture values at decoration time
             cap_include_js = include_js
             cap_include_css = include_css
+            cap_cache = cache
             parameters_of_decorated_func = list(inspect.signature(func).parameters.keys())
 
             @functools.wraps(func)
             async def decorated(*dec_args, **dec_kwargs) -> Response:
+                if cap_cache is None:
+                    response = await render_ui(*dec_args, **dec_kwargs)
+                else:
+                    response = await cap_cache.serve(
+                        dec_kwargs["request"],
+                        partial(render_ui, *dec_args, **dec_kwargs),
+                        sub_response=dec_kwargs["response"],
+                    )
+                return response
+
+            async def render_ui(*dec_args, **dec_kwargs) -> Response:
                 Frame.get_stack().del_stack()
                 Frame.get_stack()  # Create frame before function is called
                 response = dec_kwargs["response"]
@@ -262,8 +353,8 @@ class PageRouter(APIRouter):
 
                 self.add_ext(page=None, include_js=cap_include_js, include_css=cap_include_css)
 
-                content = Frame.get_stack().render()
-                return HTMLResponse(content=content, headers=standard_headers)
+                frame = Frame.get_stack()
+                return HTMLResponse(content=frame.render(), headers=standard_headers)
 
             self.__ensure_request_response_signature__(decorated)
             _router = router or self
@@ -271,6 +362,71 @@ class PageRouter(APIRouter):
 
         return decorator
 
+    def stream(
+        self,
+        path: str,
+        router: APIRouter | None = None,
+        *args,
+        heartbeat: float | None = HEARTBEAT_INTERVAL,
+        max_event_size: int = MAX_EVENT_SIZE,
+        **kwargs,
+    ) -> Callable:
+        """Register an event stream of ui updates, connect to it with ``ui.stream(path)``.
+
+        The function is an async generator. The elements it creates before a ``yield`` are
+        rendered as one update and swapped into the ``ui.stream`` element by htmx. Elements
+        with an ``hx-swap-oob`` attribute are swapped out of band, they replace the element
+        with the same id anywhere on the page. The css and js of elements such as charts are
+        added to the page with the first update that uses them.
+
+        .. code-block:: python
+            from uiwiz import UiwizApp, ui
+
+            app = UiwizApp()
+
+            @app.stream("/clock")
+            async def clock():
+                while True:
+                    ui.label(time.strftime("%X"))
+                    yield
+                    await asyncio.sleep(1)
+
+            @app.page("/")
+            def index():
+                ui.stream("/clock")
+
+        :param path: The path of the stream
+        :param router: The router the route is added to, defaults to this router
+        :param heartbeat: Seconds without an update before a heartbeat is sent to keep the
+            connection open, None disables it
+        :param max_event_size: The maximum size in bytes of an update, the stream is closed
+            when an update is larger
+        """
+
+        def decorator(func: Callable) -> Callable:
+            if not inspect.isasyncgenfunction(func):
+                raise TypeError("stream expects an async generator function")
+            cap_heartbeat = heartbeat
+            cap_max_event_size = max_event_size
+            parameters_of_decorated_func = list(inspect.signature(func).parameters.keys())
+
+            @functools.wraps(func)
+            async def decorated(*dec_args, **dec_kwargs) -> Response:
+                Frame.get_stack().del_stack()
+                frame = Frame.get_stack()
+                dec_kwargs = {k: v for k, v in dec_kwargs.items() if k in parameters_of_decorated_func}
+                return StreamingResponse(
+                    stream_updates(frame, func(*dec_args, **dec_kwargs), cap_heartbeat, cap_max_event_size),
+                    media_type=EVENT_STREAM_MEDIA_TYPE,
+                    headers=EVENT_STREAM_HEADERS,
+                )
+
+            self.__ensure_request_response_signature__(decorated)
+            _router = router or self
+            return _router.get(path, include_in_schema=False, **kwargs)(decorated)
+
+        return decorator
+
     def __ensure_request_response_signature__(self, func: Callable) -> None:
         data = {"request": Request, "response": Response}
 
@@ -0,0 +1,189 @@
+"""Pre-compressed gzip and brotli variants of static assets.
+
+Variants are compressed once and kept in memory. Run ``python -m uiwiz.precompress`` as a build step to write
+``.gz``/``.br`` files next to the assets, those are used instead of compressing at runtime.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+from email.utils import formatdate
+from mimetypes import guess_type
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import NotModifiedResponse
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+if TYPE_CHECKING:
+    import os
+
+    from starlette.types import Scope
+
+COMPRESSIBLE_SUFFIXES = frozenset({".css", ".html", ".js", ".json", ".map", ".mjs", ".svg", ".txt", ".xml"})
+MINIMUM_SIZE = 1024
+FILE_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Return the encodings that can be produced, in order of preference."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def is_compressible(name: str | Path, size: int) -> bool:
+    return size >= MINIMUM_SIZE and Path(name).suffix in COMPRESSIBLE_SUFFIXES
+
+
+def compress(content: bytes, encoding: str, *, best: bool = False) -> bytes:
+    """Compress content with the given content-coding.
+
+    :param content: the bytes to compress
+    :param encoding: ``gzip`` or ``br``
+    :param best: use the slowest and smallest setting, meant for the build step
+    """
+    if encoding == "gzip":
+        return gzip.compress(content, compresslevel=9, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(content, quality=11 if best else 6)
+    msg = f"Unsupported encoding: {encoding}"
+    raise ValueError(msg)
+
+
+def select_encoding(accept_encoding: str | None, encodings: tuple[str, ...] | None = None) -> str | None:
+    """Pick the encoding to use for a response from an Accept-Encoding header.
+
+    :param accept_encoding: the value of the Accept-Encoding request header
+    :param encodings: the encodings available, in order of preference
+    :return: the encoding or None if the response should not be encoded
+    """
+    if not accept_encoding:
+        return None
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    selected, selected_weight = None, 0.0
+    for encoding in encodings or available_encodings():
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > selected_weight:
+            selected, selected_weight = encoding, weight
+    return selected
+
+
+def read_variant(path: Path, encoding: str, content: bytes | None = None) -> bytes:
+    """Return the encoded content of a file, preferring an up to date precompressed file next to it.
+
+    :param path: the original file
+    :param encoding: ``gzip`` or ``br``
+    :param content: the content of the file if it is already read
+    """
+    variant = path.with_name(path.name + FILE_SUFFIXES[encoding])
+    try:
+        if variant.stat().st_mtime >= path.stat().st_mtime:
+            return variant.read_bytes()
+    except OSError:
+        pass
+    return compress(path.read_bytes() if content is None else content, encoding)
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles serving compressed variants of text assets based on Accept-Encoding.
+
+    The variants carry a Content-Encoding header, so GZipMiddleware passes them through untouched.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:  # noqa: ANN002, ANN003
+        super().__init__(*args, **kwargs)
+        self._variants: dict[tuple[str, str], tuple[float, bytes]] = {}
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike[str],
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        if status_code != 200 or not is_compressible(full_path, stat_result.st_size):  # noqa: PLR2004
+            return super().file_response(full_path, stat_result, scope, status_code)
+
+        request_headers = Headers(scope=scope)
+        encoding = select_encoding(request_headers.get("accept-encoding"))
+        if encoding is None:
+            response = super().file_response(full_path, stat_result, scope, status_code)
+            response.headers.add_vary_header("Accept-Encoding")
+            return response
+
+        key = (str(full_path), encoding)
+        cached = self._variants.get(key)
+        if cached is None or cached[0] != stat_result.st_mtime:
+            cached = self._variants[key] = (stat_result.st_mtime, read_variant(Path(full_path), encoding))
+
+        etag_base = f"{stat_result.st_mtime}-{stat_result.st_size}-{encoding}"
+        headers = {
+            "content-encoding": encoding,
+            "vary": "Accept-Encoding",
+            "etag": f'"{hashlib.md5(etag_base.encode(), usedforsecurity=False).hexdigest()}"',
+            "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+        }
+        media_type, _ = guess_type(str(full_path))
+        response = Response(cached[1], media_type=media_type, headers=headers)
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def precompress_directory(directory: Path, encodings: tuple[str, ...] | None = None) -> list[Path]:
+    """Write compressed variants next to every compressible file below a directory.
+
+    :param directory: the directory to walk
+    :param encodings: the encodings to write, defaults to all available
+    :return: the files written
+    """
+    written = []
+    for path in sorted(directory.rglob("*")):
+        if not path.is_file() or not is_compressible(path, path.stat().st_size):
+            continue
+        content = path.read_bytes()
+        for encoding in encodings or available_encodings():
+            variant = path.with_name(path.name + FILE_SUFFIXES[encoding])
+            if variant.exists() and variant.stat().st_mtime >= path.stat().st_mtime:
+                continue
+            variant.write_bytes(compress(content, encoding, best=True))
+            written.append(variant)
+    return written
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "directories",
+        nargs="*",
+        type=Path,
+        default=[Path(__file__).parent / "static", Path(__file__).parent / "elements"],
+        help="directories to precompress, defaults to the uiwiz static files and element extensions",
+    )
+    args = parser.parse_args(argv)
+    for directory in args.directories:
+        for path in precompress_directory(directory):
+            print(path)  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
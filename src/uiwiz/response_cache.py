@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable, Sequence
+from typing import NamedTuple
+
+from fastapi import Request, Response
+
+from uiwiz.frame import Frame
+from uiwiz.middleware.asgi_request_middleware import _request_frames_ctx_var
+
+logger = logging.getLogger("uiwiz")
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    status_code: int
+    raw_headers: list[tuple[bytes, bytes]]
+    created: float
+
+    def response(self, state: bytes) -> Response:
+        response = Response(content=self.body, status_code=self.status_code)
+        response.raw_headers = [*self.raw_headers, (b"x-uiwiz-cache", state)]
+        return response
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        ttl: float = 60,
+        maxsize: int = 128,
+        vary_headers: Sequence[str] = ("hx-target", "hx-swap"),
+        vary_cookies: Sequence[str] = ("data-theme",),
+        stale_while_revalidate: float | None = None,
+    ) -> None:
+        """Cache the rendered responses of a page or ui route in memory.
+
+        Responses are keyed on the method, path, query string, body and the selected
+        headers and cookies. Only complete 200 responses without cookies are cached,
+        streamed pages are always rendered.
+
+        .. code-block:: python
+            from uiwiz import UiwizApp, ui
+            from uiwiz.response_cache import ResponseCache
+
+            app = UiwizApp()
+
+            @app.page("/dashboard", cache=ResponseCache(ttl=30, stale_while_revalidate=300))
+            def dashboard():
+                ui.label("Read mostly content")
+
+        :param ttl: seconds a response is served from the cache
+        :param maxsize: the number of responses to keep, the least recently used is evicted
+        :param vary_headers: request headers that are part of the key. The htmx target and
+            swap are included by default as they change the ids of the rendered elements
+        :param vary_cookies: cookies that are part of the key, e.g. the theme
+        :param stale_while_revalidate: seconds after the ttl a stale response is served
+            while it is rendered again in the background
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.vary_headers = tuple(header.lower() for header in vary_headers)
+        self.vary_cookies = tuple(vary_cookies)
+        self.stale_while_revalidate = stale_while_revalidate
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self._responses: OrderedDict[Hashable, CachedResponse] = OrderedDict()
+        self._pending: dict[Hashable, asyncio.Future[CachedResponse | None]] = {}
+        self._refreshing: set[asyncio.Task[None]] = set()
+
+    async def key(self, request: Request) -> Hashable:
+        body = b""
+        if request.method not in {"GET", "HEAD"}:
+            body = hashlib.sha256(await request.body()).digest()
+        return (
+            request.method,
+            request.url.path,
+            tuple(sorted(request.query_params.multi_items())),
+            tuple(request.headers.get(header) for header in self.vary_headers),
+            tuple(request.cookies.get(cookie) for cookie in self.vary_cookies),
+            body,
+        )
+
+    def clear(self) -> None:
+        self._responses.clear()
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    async def serve(
+        self,
+        request: Request,
+        render: Callable[[], Awaitable[Response]],
+        sub_response: Response | None = None,
+    ) -> Response:
+        """Return the cached response for the request, or render and cache it.
+
+        :param request: the current request
+        :param render: renders the response, called on a miss and to revalidate
+        :param sub_response: the response the handler can set headers and cookies on,
+            the response is not cached when it sets a cookie
+        """
+        key = await self.key(request)
+        cached = self._responses.get(key)
+        if cached is not None:
+            age = time.monotonic() - cached.created
+            if age < self.ttl:
+                self.hits += 1
+                self._responses.move_to_end(key)
+                return cached.response(b"hit")
+            if self.stale_while_revalidate is not None and age < self.ttl + self.stale_while_revalidate:
+                self.stale_hits += 1
+                if key not in self._pending:
+                    task = asyncio.get_running_loop().create_task(self._revalidate(key, render, sub_response))
+                    self._refreshing.add(task)
+                    task.add_done_callback(self._refreshing.discard)
+                return cached.response(b"stale")
+
+        self.misses += 1
+        if (pending := self._pending.get(key)) is not None:
+            # The same response is being rendered, wait for it instead of rendering it again
+            cached = await asyncio.shield(pending)
+            return await render() if cached is None else cached.response(b"hit")
+        response, cached = await self._render(key, render, sub_response)
+        return response if cached is None else cached.response(b"miss")
+
+    async def _render(
+        self,
+        key: Hashable,
+        render: Callable[[], Awaitable[Response]],
+        sub_response: Response | None,
+    ) -> tuple[Response, CachedResponse | None]:
+        future = self._pending[key] = asyncio.get_running_loop().create_future()
+        cached = None
+        try:
+            response = await render()
+            if sub_response is None or "set-cookie" not in sub_response.headers:
+                cached = self._store(key, response)
+        finally:
+            future.set_result(cached)
+            del self._pending[key]
+        return response, cached
+
+    async def _revalidate(
+        self,
+        key: Hashable,
+        render: Callable[[], Awaitable[Response]],
+        sub_response: Response | None,
+    ) -> None:
+        # The request that started the refresh may end first, its frames are released with it
+        _request_frames_ctx_var.set(None)
+        try:
+            await self._render(key, render, sub_response)
+        except Exception:
+            logger.exception("Failed to revalidate cached response")
+        finally:
+            # The refresh renders in its own frame, release it if the render failed
+            Frame.del_stack()
+
+    def _store(self, key: Hashable, response: Response) -> CachedResponse | None:
+        body = getattr(response, "body", None)
+        if body is None or response.status_code != 200 or "set-cookie" in response.headers:  # noqa: PLR2004
+            return None
+        cached = CachedResponse(bytes(body), response.status_code, list(response.raw_headers), time.monotonic())
+        self._responses[key] = cached
+        self._responses.move_to_end(key)
+        while len(self._responses) > self.maxsize:
+            self._responses.popitem(last=False)
+        return cached
@@ -0,0 +1,134 @@
+"""JSON serialization used by the elements, responses and toasts.
+
+Uses orjson when it is installed, ``pip install uiwiz[orjson]``, and the standard library otherwise.
+Both produce compact json with the same handling of dates, polars and pydantic types. NaN and
+infinity are written as ``null``, they are not valid json, and integers of any size are accepted.
+Another encoder can be plugged in with :func:`set_encoder`.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import json
+import math
+from collections.abc import Callable
+from decimal import Decimal
+from enum import Enum
+from pathlib import PurePath
+from typing import Any
+from uuid import UUID
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+Encoder = Callable[[Any, bool], bytes]
+
+
+def default(obj: Any) -> Any:  # noqa: ANN401, C901, PLR0911
+    """Convert the types json does not support, unknown types are converted with ``str``."""
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode(errors="replace")
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if isinstance(obj, (UUID, PurePath, datetime.timedelta)):
+        return str(obj)
+    # polars is imported by the caller when one of its types is serialized
+    module = type(obj).__module__
+    if module.startswith("polars"):
+        if hasattr(obj, "to_dicts"):
+            return obj.to_dicts()
+        if hasattr(obj, "to_list"):
+            return obj.to_list()
+    return str(obj)
+
+
+def _finite(obj: Any) -> Any:  # noqa: ANN401
+    """Replace NaN and infinity with None, like orjson does."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(value) for value in obj]
+    return obj
+
+
+def _stdlib_encoder(obj: Any, indent: bool) -> bytes:  # noqa: ANN401, FBT001
+    layout = {"indent": 2} if indent else {"separators": (",", ":")}
+    try:
+        return json.dumps(obj, default=default, ensure_ascii=False, allow_nan=False, **layout).encode()
+    except ValueError:
+        # Only walk the object again when it has a float json can not represent
+        return json.dumps(
+            _finite(obj),
+            default=lambda value: _finite(default(value)),
+            ensure_ascii=False,
+            allow_nan=False,
+            **layout,
+        ).encode()
+
+
+def _orjson_encoder(obj: Any, indent: bool) -> bytes:  # noqa: ANN401, FBT001
+    option = orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    try:
+        return orjson.dumps(obj, default=default, option=option)
+    except orjson.JSONEncodeError:
+        # orjson rejects integers over 64 bits, the standard library writes them
+        return _stdlib_encoder(obj, indent)
+
+
+_encoder: Encoder = _stdlib_encoder if orjson is None else _orjson_encoder
+
+
+def set_encoder(encoder: Encoder | None = None) -> None:
+    """Replace the json encoder.
+
+    :param encoder: a function of the object and whether to indent returning utf-8 json,
+        it should call :func:`default` for unsupported types. None restores the default encoder
+    """
+    global _encoder  # noqa: PLW0603
+    if encoder is None:
+        encoder = _stdlib_encoder if orjson is None else _orjson_encoder
+    _encoder = encoder
+
+
+def dumps_bytes(obj: Any, *, indent: bool = False) -> bytes:  # noqa: ANN401
+    return _encoder(obj, indent)
+
+
+def dumps(obj: Any, *, indent: bool = False) -> str:  # noqa: ANN401
+    return _encoder(obj, indent).decode()
+
+
+def dumps_attribute(obj: Any, *, indent: bool = False) -> str:  # noqa: ANN401
+    """Serialize to json that can be placed in a double quoted html attribute as it is.
+
+    Only ``&`` and ``"`` have to be escaped inside a double quoted attribute. Set the result
+    without escaping it again, ``element.attributes.__setitem__(name, value, False)``.
+    """
+    return dumps(obj, indent=indent).replace("&", "&amp;").replace('"', "&quot;")
+
+
+class UiwizJSONResponse(JSONResponse):
+    """JSONResponse rendered with the uiwiz encoder."""
+
+    def render(self, content: Any) -> bytes:  # noqa: ANN401
+        return dumps_bytes(content)
@@ -1,8 +1,33 @@
-from uiwiz.server._server import Config, Server
+from uiwiz.server._server import Config, Multiprocess, Server, logger
 
 
-def run(app: str, host: str = "localhost", port: int = 8080):
-    config = Config(host=host, port=port, app=app, root_path="")
+def run(app: str, host: str = "localhost", port: int = 8080, reload: bool = True, workers: int = 1):
+    """Run the development server.
+
+    :param app: the application as an import string, e.g. ``"main:app"``
+    :param host: the interface to bind
+    :param port: the port to bind
+    :param reload: reload the application when its source files change
+    :param workers: number of worker processes sharing the listening socket. Reloading is
+        disabled when more than one worker is used. Handlers registered with anonymous
+        functions only exist in the worker that rendered them, use named routes when
+        running more than one worker. Paginated tables, server side Aggrid rows and downsampled
+        EChart zoom keep their data in the worker that rendered them, they need a single worker
+        or a proxy routing the requests of a client to the same worker.
+    """
+    if workers > 1 and reload:
+        logger.warning("Reload is not supported with multiple workers, disabling it")
+        reload = False
+    if workers > 1:
+        logger.warning(
+            "Paginated tables, server side Aggrid rows and EChart zoom keep their data in the worker "
+            "that rendered them, route the requests of a client to the same worker when using them"
+        )
+    config = Config(host=host, port=port, app=app, root_path="", reload=reload, workers=workers)
+
+    if workers > 1:
+        Multiprocess(config).run()
+        return
 
     server = Server(config)
     server.run()
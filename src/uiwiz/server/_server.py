@@ -1,15 +1,22 @@
 import asyncio
-import copy
 import http
 import importlib
 import logging
+import multiprocessing
+import os
 import re
+import signal
+import socket
+import sys
+import threading
 import urllib
 from asyncio import Event, Queue, TimerHandle
 from collections import deque
 from contextlib import suppress
 from dataclasses import dataclass
+from pathlib import Path
 from time import perf_counter
+from types import FrameType
 from typing import Any
 
 import httptools
@@ -19,7 +26,6 @@ from uvicorn._types import (
 from uvicorn.protocols.http.flow_control import HIGH_WATER_LIMIT, FlowControl
 from uvicorn.protocols.http.httptools_impl import RequestResponseCycle
 
-from uiwiz import shared
 from uiwiz.app import UiwizApp
 
 formatter = logging.Formatter(
@@ -44,32 +50,103 @@ class Config:
     root_path: str
     app: str | None = None
     app_instance: UiwizApp | None = None
+    reload: bool = True
+    reload_interval: float = 0.5
+    workers: int = 1
+    timeout_graceful_shutdown: float = 10.0
 
 
-def import_app_instance(config: Config) -> None:
+def import_app_instance(config: Config, changed: set[Path] | None = None) -> None:
     start = perf_counter()
     if isinstance(config.app, str):
-        routes = []
-        if config.app_instance is not None:
-            # As the user can register new endpoints with a lambda function and this can happen inside of an endpoint
-            # i.e not when the application is first loaded but during the exeuction of the endpoint. It is nesscary to
-            # save the endpoint data and transfer it to the newly created application
-            routes = copy.copy(config.app_instance.router.routes)
-            _page_map = copy.copy(shared.page_map)
-            _resources = copy.copy(shared.resources)
-
+        previous = config.app_instance
         module_name, _, app = config.app.partition(":")
+        if changed:
+            reload_changed_modules(changed, exclude=module_name)
         module = importlib.import_module(module_name)
-        module = importlib.reload(module)
+        if previous is not None:
+            module = importlib.reload(module)
         config.app_instance = getattr(module, app)
-        if routes:
-            config.app_instance.router.routes = routes
-            shared.page_map = _page_map
-            shared.resources = _resources
+        if previous is not None:
+            # As the user can register new endpoints with a lambda function and this can happen inside of an endpoint
+            # i.e not when the application is first loaded but during the exeuction of the endpoint. It is nesscary to
+            # transfer the endpoints the reloaded module does not define to the newly created application
+            paths = {getattr(route, "path", None) for route in config.app_instance.router.routes}
+            for route in previous.router.routes:
+                if getattr(route, "path", None) not in paths:
+                    config.app_instance.router.routes.append(route)
     else:
         config.app_instance = config.app
     end = perf_counter()
-    logger.info(f"Module reloaded in: {end - start}")
+    logger.info(f"Module reloaded in: {(end - start) * 1000:.1f} ms")
+
+
+def reload_changed_modules(changed: set[Path], exclude: str) -> None:
+    """Reload the imported modules of the changed files, the app module is reloaded last by the caller."""
+    for name, module in list(sys.modules.items()):
+        file = getattr(module, "__file__", None)
+        if name != exclude and file and Path(file).resolve() in changed:
+            logger.info(f"Reloading {name}")
+            importlib.reload(module)
+
+
+IGNORED_DIRECTORIES = frozenset({"__pycache__", "node_modules", "venv", "env", "site-packages", "build", "dist"})
+
+
+class SourceWatcher:
+    def __init__(self, root: Path, interval: float = 0.5) -> None:
+        """Poll the python files below root for changes.
+
+        :param root: The directory to watch
+        :param interval: Seconds between polls. Changes are reported once a poll sees no further changes,
+            so saving several files at once results in a single reload.
+        """
+        self.root = root.resolve()
+        self.interval = interval
+        self.mtimes: dict[Path, float] = self.snapshot()
+
+    @staticmethod
+    def ignored(directory: Path) -> bool:
+        """Skip hidden directories, caches, build output and virtual environments."""
+        if directory.name.startswith(".") or directory.name in IGNORED_DIRECTORIES:
+            return True
+        # A virtual environment with another name, e.g. created with python -m venv myenv
+        return (directory / "pyvenv.cfg").exists()
+
+    def snapshot(self) -> dict[Path, float]:
+        mtimes = {}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if not self.ignored(Path(dirpath) / d)]
+            for filename in filenames:
+                if filename.endswith(".py"):
+                    path = Path(dirpath) / filename
+                    with suppress(OSError):
+                        mtimes[path] = path.stat().st_mtime
+        return mtimes
+
+    def changes(self) -> set[Path]:
+        mtimes = self.snapshot()
+        changed = {path for path, mtime in mtimes.items() if self.mtimes.get(path) != mtime}
+        changed.update(self.mtimes.keys() - mtimes.keys())
+        self.mtimes = mtimes
+        return changed
+
+    async def watch(self, config: Config) -> None:
+        pending: set[Path] = set()
+        while True:
+            await asyncio.sleep(self.interval)
+            changed = await asyncio.to_thread(self.changes)
+            if changed:
+                # Wait until the files stop changing
+                pending |= changed
+                continue
+            if pending:
+                logger.info(f"Detected changes in {', '.join(str(path) for path in sorted(pending))}")
+                try:
+                    import_app_instance(config, pending)
+                except Exception:
+                    logger.exception("Reload failed, serving the previous application")
+                pending = set()
 
 
 class LifespanHandler:
@@ -182,8 +259,10 @@ class HttpToolsImpl(asyncio.Protocol):
         self.server = self.get_local_addr()
         self.client = self.get_remote_addr()
         self.scheme = "https" if bool(transport.get_extra_info("sslcontext")) else "http"
+        self.server_state.connections.add(self)
 
     def connection_lost(self, exc: Exception | None) -> None:
+        self.server_state.connections.discard(self)
         if self.cycle and not self.cycle.response_complete:
             self.cycle.disconnected = True
         if self.cycle is not None:
@@ -224,8 +303,6 @@ class HttpToolsImpl(asyncio.Protocol):
         self.scope["raw_path"] = full_raw_path
         self.scope["query_string"] = parsed_url.query or b""
 
-        import_app_instance(self.config)
-
         existing_cycle = self.cycle
         self.cycle = RRCycle(
             scope=self.scope,
@@ -241,20 +318,14 @@ class HttpToolsImpl(asyncio.Protocol):
             on_response=self.on_response_complete,
         )
         if existing_cycle is None or existing_cycle.response_complete:
-            self.tasks.add(self.loop.create_task(self.cycle.run_asgi(self.config.app_instance)))
+            task = self.loop.create_task(self.cycle.run_asgi(self.config.app_instance))
+            task.add_done_callback(self.tasks.discard)
+            self.tasks.add(task)
         else:
             # Pipelined HTTP requests need to be queued up.
             self.flow.pause_reading()
             self.pipeline.appendleft((self.cycle, self.config.app_instance))
 
-    def _shutdown(self, *args) -> None:
-        task = self.loop.create_task(self.lifespan.shutdown())
-        task.add_done_callback(self.tasks.discard)
-        self.tasks.add(task)
-
-        done = {ta for ta in set(self.tasks) if ta.done()}
-        self.tasks.difference_update(done)
-
     def on_message_begin(self) -> None:
         self.url = b""
         self.expect_100_continue = False
@@ -401,6 +472,7 @@ class RRCycle(RequestResponseCycle):
 
     # ASGI exception wrapper
     async def run_asgi(self, app: ASGI3Application) -> None:
+        start = perf_counter()
         try:
             result = await app(  # type: ignore[func-returns-value]
                 self.scope,
@@ -429,6 +501,8 @@ class RRCycle(RequestResponseCycle):
                 self.transport.close()
         finally:
             self.on_response = lambda: None
+            end = perf_counter()
+            self.logger.info(f"{self.scope['method']} {self.scope['path']} handled in: {(end - start) * 1000:.1f} ms")
 
 
 class Server:
@@ -436,27 +510,130 @@ class Server:
         logger.warning("Development server. Do not use in production!")
         self.config = config
         self.server_state = None
+        self.should_exit: Event | None = None
         import_app_instance(config)
 
-    def run(self) -> None:
+    def run(self, sock: socket.socket | None = None) -> None:
+        """Serve until SIGINT or SIGTERM is received.
+
+        :param sock: an already bound listening socket, used by the worker processes
+        """
         try:
-            return asyncio.run(self._serve(), debug=True)
+            return asyncio.run(self._serve(sock), debug=True)
         except KeyboardInterrupt:
             return None
 
-    async def _serve(self) -> None:
+    def _install_signal_handlers(self, loop: asyncio.AbstractEventLoop) -> None:
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            with suppress(NotImplementedError):  # Not supported by the windows event loop
+                loop.add_signal_handler(sig, self.should_exit.set)
+
+    async def _serve(self, sock: socket.socket | None = None) -> None:
         loop = asyncio.get_running_loop()
         self.server_state = ServerState(self.config)
-        server = await loop.create_server(
-            lambda: HttpToolsImpl(self.config, self.server_state),
-            host=self.config.host,
-            port=self.config.port,
-        )
+        self.should_exit = Event()
+        self._install_signal_handlers(loop)
+
+        def protocol_factory() -> HttpToolsImpl:
+            return HttpToolsImpl(self.config, self.server_state)
+
+        if sock is not None:
+            server = await loop.create_server(protocol_factory, sock=sock)
+        else:
+            server = await loop.create_server(protocol_factory, host=self.config.host, port=self.config.port)
+        watcher = None
+        if self.config.reload and isinstance(self.config.app, str):
+            module = sys.modules[self.config.app.partition(":")[0]]
+            source_watcher = SourceWatcher(Path(module.__file__).parent, self.config.reload_interval)
+            watcher = loop.create_task(source_watcher.watch(self.config))
         async with server:
             await loop.create_task(self.server_state.lifespan.startup())
             try:
-                await server.serve_forever()
+                await self.should_exit.wait()
             except asyncio.exceptions.CancelledError:
-                await self.server_state.lifespan.shutdown()
-                return
-            await self.server_state.lifespan.shutdown()
+                pass
+            finally:
+                if watcher is not None:
+                    watcher.cancel()
+            await self._shutdown(server)
+
+    async def _shutdown(self, server: asyncio.Server) -> None:
+        """Stop accepting connections, let in-flight requests finish and run the lifespan shutdown."""
+        server.close()
+        for connection in list(self.server_state.connections):
+            connection.shutdown()
+
+        if self.server_state.tasks:
+            _, pending = await asyncio.wait(set(self.server_state.tasks), timeout=self.config.timeout_graceful_shutdown)
+            for task in pending:
+                task.cancel()
+
+        await self.server_state.lifespan.shutdown()
+
+
+def _run_worker(config: Config, sock: socket.socket) -> None:
+    Server(config).run(sock)
+
+
+class Multiprocess:
+    """Pre-fork supervisor that shares one listening socket between ``config.workers`` processes.
+
+    The kernel hands each incoming connection to one of the workers. SIGINT and SIGTERM are
+    forwarded to the workers so each one drains its requests and runs the lifespan shutdown.
+    Workers that die unexpectedly are restarted.
+    """
+
+    def __init__(self, config: Config) -> None:
+        if not isinstance(config.app, str):
+            msg = "Running multiple workers requires the app as an import string, e.g. 'main:app'"
+            raise ValueError(msg)
+        self.config = config
+        self.context = multiprocessing.get_context("spawn")
+        self.processes: list[multiprocessing.process.BaseProcess] = []
+        self.should_exit = threading.Event()
+
+    def bind_socket(self) -> socket.socket:
+        sock = socket.create_server((self.config.host, self.config.port), backlog=2048)
+        sock.set_inheritable(True)
+        return sock
+
+    def spawn_worker(self, sock: socket.socket, index: int) -> multiprocessing.process.BaseProcess:
+        process = self.context.Process(target=_run_worker, args=(self.config, sock), name=f"uiwiz-worker-{index}")
+        process.start()
+        return process
+
+    def handle_exit(self, sig: int, frame: FrameType | None) -> None:  # noqa: ARG002
+        self.should_exit.set()
+
+    def run(self) -> None:
+        sock = self.bind_socket()
+        logger.info("Started parent process [%s] on %s:%s", os.getpid(), self.config.host, self.config.port)
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, self.handle_exit)
+        try:
+            self.processes = [self.spawn_worker(sock, index) for index in range(self.config.workers)]
+            while not self.should_exit.wait(0.5):
+                for index, process in enumerate(self.processes):
+                    if not process.is_alive():
+                        logger.warning(
+                            "Worker %s [%s] exited with %s, restarting",
+                            index,
+                            process.pid,
+                            process.exitcode,
+                        )
+                        self.processes[index] = self.spawn_worker(sock, index)
+        finally:
+            self.shutdown()
+            sock.close()
+
+    def shutdown(self) -> None:
+        for process in self.processes:
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGTERM)
+        for process in self.processes:
+            process.join(self.config.timeout_graceful_shutdown + 5)
+            if process.is_alive():
+                logger.warning("Worker [%s] did not stop in time, killing it", process.pid)
+                process.kill()
+                process.join()
+        logger.info("Stopped parent process [%s]", os.getpid())
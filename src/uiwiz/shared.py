@@ -2,18 +2,41 @@ from __future__ import annotations
 
 import hashlib
 import inspect
+import weakref
+from collections import OrderedDict
 from functools import cache
-from typing import TYPE_CHECKING
+from mimetypes import guess_type
+from typing import TYPE_CHECKING, Generic, NamedTuple, TypeVar
+
+from uiwiz.precompress import read_variant
 
 if TYPE_CHECKING:
     from collections.abc import Callable
     from pathlib import Path
+    from types import CodeType
 
+T = TypeVar("T")
 resources: dict[str, Path] = {}
 page_map: dict[Callable, str] = {}
+# Reverse index of page_map, the number of functions registered for each path
+page_paths: dict[str, int] = {}
+
+# sha256 of the source code, keyed by the code object of the function. Closures created
+# per request share the code object of their definition, so the source is only read once.
+# Weak keys let code objects of reloaded modules be freed.
+_source_hashes: weakref.WeakKeyDictionary[CodeType, hashlib._Hash] = weakref.WeakKeyDictionary()
 
 
 @cache
+def _hash_callable(func: Callable) -> str:
+    try:
+        source = inspect.getsource(func) + func.__name__
+    except (TypeError, OSError):
+        # Fallback for built-in functions or functions without source code
+        source = f"{func.__module__}.{func.__qualname__}"
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
 def _hash_function_extended(func: Callable) -> str:
     """This was an interesting problem. I needed to hash the function.
 
@@ -22,31 +45,166 @@ def _hash_function_extended(func: Callable) -> str:
     uvicorn and multiple workers. The function object is not the
     same in different workers, so I had to use the source code
     to generate a hash that would be the same in all workers.
+
+    The hash of the source is cached per code object, only the name of
+    the function is hashed on top of it for every call.
     """
-    try:
-        source = inspect.getsource(func) + func.__name__
-    except (TypeError, OSError):
-        # Fallback for built-in functions or functions without source code
-        source = f"{func.__module__}.{func.__qualname__}"
-    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+    code: CodeType | None = getattr(inspect.unwrap(func), "__code__", None)
+    if code is None:
+        return _hash_callable(func)
+
+    source_hash = _source_hashes.get(code)
+    if source_hash is None:
+        try:
+            source = inspect.getsource(func)
+        except (TypeError, OSError):
+            return _hash_callable(func)
+        source_hash = hashlib.sha256(source.encode("utf-8"))
+        _source_hashes[code] = source_hash
+
+    name_hash = source_hash.copy()
+    name_hash.update(func.__name__.encode("utf-8"))
+    return name_hash.hexdigest()
+
+
+class CachedResource(NamedTuple):
+    path: Path
+    content: bytes
+    etag: str
+    media_type: str | None
+    # Compressed variants of content, keyed by content-coding
+    encoded: dict[str, bytes]
+
+    def encode(self, encoding: str) -> bytes:
+        if encoding not in self.encoded:
+            self.encoded[encoding] = read_variant(self.path, encoding, self.content)
+        return self.encoded[encoding]
+
+
+# Content of the registered resources, read once so requests are served from memory
+resource_cache: dict[str, CachedResource] = {}
+
+
+def _read_resource(key: str, resource: Path) -> CachedResource:
+    content = resource.read_bytes()
+    etag = f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+    media_type, _ = guess_type(key)
+    return CachedResource(resource, content, etag, media_type, {})
 
 
 def register_resource(key: str, resource: Path) -> None:
     resources[key] = resource
+    resource_cache.pop(key, None)
+    if resource.is_file():
+        resource_cache[key] = _read_resource(key, resource)
+
+
+def get_resource(key: str) -> CachedResource | None:
+    """Return the cached content of a registered resource.
+
+    :param key: the resource key, ``{extension}/{filename}``
+    :return: the cached resource or None if it is not registered or cannot be read
+    """
+    cached = resource_cache.get(key)
+    if cached is None and key in resources:
+        try:
+            cached = resource_cache[key] = _read_resource(key, resources[key])
+        except OSError:
+            return None
+    return cached
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an If-None-Match header against an etag using weak comparison.
+
+    :param if_none_match: the value of the If-None-Match request header
+    :param etag: the quoted etag of the current representation
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
 
 
 def register_path(key: str, func: Callable) -> None:
-    page_map[_hash_function_extended(func)] = key
+    func_hash = _hash_function_extended(func)
+    previous = page_map.get(func_hash)
+    if previous == key:
+        return
+    if previous is not None:
+        _unregister_page_path(previous)
+    page_map[func_hash] = key
+    page_paths[key] = page_paths.get(key, 0) + 1
+
+
+def _unregister_page_path(path: str) -> None:
+    count = page_paths.get(path, 0)
+    if count <= 1:
+        page_paths.pop(path, None)
+    else:
+        page_paths[path] = count - 1
 
 
 def fetch_route(func: Callable) -> str | None:
     return page_map.get(_hash_function_extended(func))
 
 
+class SourceCache(Generic[T]):
+    def __init__(self, sizeof: Callable[[T], int], maxsize: int = 128, max_bytes: int = 256 * 1024 * 1024) -> None:
+        """Store the data elements fetch again after they are rendered, with least recently used eviction.
+
+        The data is kept in the memory of the process that rendered the element. When the app
+        runs more than one worker, the requests of a client must be routed to the same worker.
+
+        :param sizeof: estimates the size of a source in bytes
+        :param maxsize: the number of sources to keep
+        :param max_bytes: the estimated size of the sources to keep, the most recent source is
+            always kept
+        """
+        self.sizeof = sizeof
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._sources: OrderedDict[str, tuple[T, int]] = OrderedDict()
+
+    def get(self, token: str) -> T | None:
+        entry = self._sources.get(token)
+        if entry is None:
+            return None
+        self._sources.move_to_end(token)
+        return entry[0]
+
+    def set(self, token: str, source: T) -> None:
+        self.invalidate(token)
+        size = self.sizeof(source)
+        self._sources[token] = (source, size)
+        self.size += size
+        while len(self._sources) > 1 and (len(self._sources) > self.maxsize or self.size > self.max_bytes):
+            _, (_, evicted) = self._sources.popitem(last=False)
+            self.size -= evicted
+
+    def invalidate(self, token: str | None = None) -> None:
+        """Remove a source, or all sources when no token is given."""
+        if token is None:
+            self._sources.clear()
+            self.size = 0
+        elif (entry := self._sources.pop(token, None)) is not None:
+            self.size -= entry[1]
+
+    def __contains__(self, token: str) -> bool:
+        return token in self._sources
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+
 def reset_resources() -> None:
     resources.clear()
+    resource_cache.clear()
     page_map.clear()
+    page_paths.clear()
 
 
 def route_exists(path: str) -> bool:
-    return path in list(page_map.values())
+    return path in page_paths
@@ -0,0 +1,120 @@
+"""Server-Sent Events, https://html.spec.whatwg.org/multipage/server-sent-events.html."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from contextlib import aclosing
+from typing import TYPE_CHECKING, Any
+from uuid import uuid4
+
+import anyio
+
+from uiwiz.middleware.asgi_request_middleware import _frame_ctx_var
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, AsyncIterator
+
+    from uiwiz.frame import Frame
+
+logger = logging.getLogger("uiwiz")
+
+EVENT_STREAM_MEDIA_TYPE = "text/event-stream"
+# Proxies such as nginx buffer responses unless they are told not to
+EVENT_STREAM_HEADERS = {"cache-control": "no-cache", "x-accel-buffering": "no"}
+HEARTBEAT_INTERVAL = 15.0
+MAX_EVENT_SIZE = 1024 * 1024
+
+# Comments are ignored by the browser, they keep idle connections from being closed by proxies
+HEARTBEAT = b": heartbeat\n\n"
+_LINE_BREAK = re.compile(r"\r\n|\r|\n")
+
+
+def format_event(data: str, event: str | None = None) -> bytes:
+    """Encode a message of an event stream, every line of data is sent as a ``data`` field.
+
+    :param data: the data of the message
+    :param event: the event type, ``message`` when it is not set
+    """
+    lines = [] if event is None else [f"event: {event}"]
+    lines.extend(f"data: {line}" for line in _LINE_BREAK.split(data))
+    return ("\n".join(lines) + "\n\n").encode()
+
+
+async def event_stream(
+    messages: AsyncGenerator[bytes, None],
+    heartbeat: float | None = HEARTBEAT_INTERVAL,
+) -> AsyncIterator[bytes]:
+    """Send the messages of a stream, with heartbeats while waiting and a ``close`` event at the end.
+
+    The next message is only requested once the previous one has been sent, a slow client
+    pauses the generator instead of messages piling up in memory. The ``close`` event tells
+    the browser the stream is done, otherwise it reconnects and the stream starts over.
+
+    :param messages: yields the encoded messages, see :func:`format_event`
+    :param heartbeat: seconds without a message before a heartbeat comment is sent, None disables it
+    """
+    pending: asyncio.Future | None = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(anext(messages))
+            done, _ = await asyncio.wait({pending}, timeout=heartbeat)
+            if not done:
+                yield HEARTBEAT
+                continue
+            message, pending = pending, None
+            try:
+                data = message.result()
+            except StopAsyncIteration:
+                break
+            yield data
+        yield format_event("", event="close")
+    finally:
+        # The client disconnected or the stream ended, stop the generator
+        with anyio.CancelScope(shield=True):
+            if pending is not None:
+                pending.cancel()
+                await asyncio.wait({pending})
+            await messages.aclose()
+
+
+async def stream_updates(
+    frame: Frame,
+    updates: AsyncGenerator[Any, None],
+    heartbeat: float | None = HEARTBEAT_INTERVAL,
+    max_event_size: int = MAX_EVENT_SIZE,
+) -> AsyncIterator[bytes]:
+    """Render the elements created by ``updates`` in the frame as one message per yield.
+
+    The messages are sent by :func:`event_stream`. The frame only holds the elements of the
+    current update and a message larger than ``max_event_size`` ends the stream. The elements
+    get ids of their own, they do not clash with the ids of the page.
+
+    :param frame: the frame of the connection
+    :param updates: creates the elements of an update and yields when it is complete
+    :param heartbeat: seconds without an update before a heartbeat comment is sent, None disables it
+    :param max_event_size: the maximum size of a message in bytes
+    """
+
+    async def messages() -> AsyncGenerator[bytes, None]:
+        try:
+            with frame.id_scope(f"s{uuid4().hex[:12]}-"):
+                async for _ in updates:
+                    message = format_event(frame.drain())
+                    if len(message) > max_event_size:
+                        logger.error("Event stream update of %d bytes exceeds max_event_size, closing", len(message))
+                        return
+                    yield message
+        finally:
+            await updates.aclose()
+
+    # The response body may be iterated in its own task
+    _frame_ctx_var.set(frame)
+    try:
+        async with aclosing(event_stream(messages(), heartbeat)) as stream:
+            async for message in stream:
+                yield message
+    finally:
+        frame.release()
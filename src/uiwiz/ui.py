@@ -17,6 +17,7 @@ from uiwiz.elements.echart.echart import EChart as echart
 from uiwiz.element import Element as element
 from uiwiz.elements.footer import Footer as footer
 from uiwiz.elements.form import Form as form
+from uiwiz.fragment_cache import cached_fragment as cached_fragment
 from uiwiz.elements.full_width import FullWidth as fullWidth
 from uiwiz.elements.hidden_input import HiddenInput as hiddenInput
 from uiwiz.elements.html import Html as html
@@ -30,6 +31,7 @@ from uiwiz.elements.range import Range as range
 from uiwiz.elements.row import Row as row
 from uiwiz.elements.number import Number as number
 from uiwiz.elements.spinner import Spinner as spinner
+from uiwiz.elements.stream.stream import Stream as stream
 from uiwiz.elements.table import Table as table
 from uiwiz.elements.tabs import Tab as tab
 from uiwiz.elements.tabs import Tabs as tabs
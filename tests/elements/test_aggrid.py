@@ -0,0 +1,108 @@
+import datetime
+import io
+import json
+from html import unescape
+
+import polars as pl
+from bs4 import BeautifulSoup
+from fastapi.testclient import TestClient
+
+from uiwiz import ui
+from uiwiz.elements.aggrid.aggrid import grid_sources
+
+
+def test_aggrid_server_side(setup_app):
+    df = pl.DataFrame(
+        {
+            "id": list(range(1000)),
+            "name": [f"Name {i}" for i in range(1000)],
+            "created": [datetime.date(2024, 1, 1) + datetime.timedelta(days=i) for i in range(1000)],
+        },
+    )
+
+    @setup_app.page("/")
+    def index():
+        ui.aggrid(df, server_side=True, block_size=50)
+
+    client = TestClient(setup_app)
+    grid = BeautifulSoup(client.get("/").text, "html.parser").select_one("[hx-aggrid]")
+    assert "hx-aggrid-rows" not in grid.attrs
+    assert grid.attrs["hx-aggrid-block-size"] == "50"
+    assert json.loads(unescape(grid.attrs["hx-aggrid-cols"]))[0] == {
+        "field": "id",
+        "filter": "agNumberColumnFilter",
+        "sortable": True,
+    }
+
+    source = grid.attrs["hx-aggrid-source"]
+    block = client.post(source, json={"startRow": 50, "endRow": 100}).json()
+    assert block["lastRow"] == 1000
+    assert [row["id"] for row in block["rows"]] == list(range(50, 100))
+
+    block = client.post(
+        source,
+        json={
+            "startRow": 0,
+            "endRow": 3,
+            "sortModel": [{"colId": "id", "sort": "desc"}, {"colId": "unknown", "sort": "asc"}],
+            "filterModel": {
+                "name": {"filterType": "text", "type": "contains", "filter": "NAME 9"},
+                "id": {
+                    "filterType": "number",
+                    "operator": "OR",
+                    "conditions": [
+                        {"filterType": "number", "type": "lessThan", "filter": 100},
+                        {"filterType": "number", "type": "greaterThanOrEqual", "filter": 990},
+                    ],
+                },
+                "created": {"filterType": "date", "type": "greaterThan", "dateFrom": "2024-01-01 00:00:00"},
+            },
+        },
+    ).json()
+    assert block["lastRow"] == 21
+    assert [row["id"] for row in block["rows"]] == [999, 998, 997]
+    assert block["rows"][0]["created"] == "2026-09-26"
+
+    assert client.post("/_uiwiz/aggrid/unknown", json={}).status_code == 404
+
+
+def test_aggrid_server_side_sources_capped_by_size(setup_app, monkeypatch):
+    small = pl.DataFrame({"id": list(range(10))})
+    large = pl.DataFrame({"id": list(range(1000))})
+    monkeypatch.setattr(grid_sources, "max_bytes", large.estimated_size())
+
+    @setup_app.page("/{rows}")
+    def index(rows: int):
+        ui.aggrid(small if rows == 10 else large, server_side=True)
+
+    client = TestClient(setup_app)
+    sources = []
+    for rows in (10, 1000):
+        grid = BeautifulSoup(client.get(f"/{rows}").text, "html.parser").select_one("[hx-aggrid]")
+        sources.append(grid.attrs["hx-aggrid-source"])
+
+    response = client.post(sources[0], json={})
+    assert response.status_code == 404
+    assert "no longer available" in response.json()["detail"]
+    assert client.post(sources[1], json={"startRow": 0, "endRow": 5}).json()["lastRow"] == 1000
+
+
+def test_aggrid_arrow_response():
+    df = pl.DataFrame(
+        {
+            "id": [1, None],
+            "name": ["Alice", None],
+            "created": [datetime.date(2024, 1, 1), None],
+            "tags": [["a"], None],
+        },
+    )
+    response = ui.aggrid.arrow_response(df, headers={"x-extra": "1"})
+    assert response.media_type == "application/vnd.apache.arrow.stream"
+    assert response.headers["hx-trigger"] == "aggridUpdate"
+    assert response.headers["x-extra"] == "1"
+
+    decoded = pl.read_ipc_stream(io.BytesIO(response.body))
+    assert dict(decoded.schema) == {"id": pl.Int64, "name": pl.String, "created": pl.String, "tags": pl.String}
+    assert decoded.row(0) == (1, "Alice", "2024-01-01", "['a']")
+    assert decoded.row(1) == (None, None, None, None)
+    assert pl.read_ipc_stream(io.BytesIO(ui.aggrid.to_arrow(None))).is_empty()
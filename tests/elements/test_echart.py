@@ -0,0 +1,139 @@
+import asyncio
+import json
+import math
+from html import unescape
+
+import polars as pl
+from bs4 import BeautifulSoup
+from fastapi.testclient import TestClient
+
+from uiwiz import ui
+from uiwiz.elements.echart.downsample import lttb_indices, min_max_indices
+from uiwiz.elements.echart.echart import _source_size, chart_sources
+from uiwiz.sse import HEARTBEAT
+
+
+def test_lttb_keeps_ends_and_peaks():
+    x = pl.Series([float(i) for i in range(10_000)])
+    y = pl.Series([100.0 if i == 4321 else math.sin(i / 100) for i in range(10_000)])
+
+    indices = lttb_indices(x, y, 100).to_list()
+    assert len(indices) == 100
+    assert indices == sorted(indices)
+    assert indices[0] == 0
+    assert indices[-1] == 9999
+    assert 4321 in indices
+
+
+def test_min_max_keeps_extremes_of_buckets():
+    x = pl.Series([float(i) for i in range(1000)])
+    y = pl.Series([float(i % 10) for i in range(1000)])
+
+    indices = min_max_indices(x, y, 20).to_list()
+    assert indices[0] == 0
+    assert indices[-1] == 999
+    assert len(indices) <= 20
+    assert {y[i] for i in indices} == {0.0, 9.0}
+
+
+def test_echart_downsample_and_zoom(setup_app):
+    points = [[i, math.sin(i / 50)] for i in range(5000)]
+
+    @setup_app.page("/")
+    def index():
+        ui.echart(
+            {
+                "xAxis": {"type": "value"},
+                "yAxis": {},
+                "series": [{"type": "line", "data": [1, 2, 3]}, {"type": "line", "data": points}],
+            },
+            max_points=200,
+        )
+
+    client = TestClient(setup_app)
+    chart = BeautifulSoup(client.get("/").text, "html.parser").select_one("[data-wz-echart-options]")
+    options = json.loads(unescape(chart.attrs["data-wz-echart-options"]))
+    assert options["series"][0]["data"] == [1, 2, 3]
+    assert len(options["series"][1]["data"]) == 200
+    assert options["series"][1]["data"][0] == [0, 0.0]
+    assert options["dataZoom"] == [{"type": "inside"}, {"type": "slider"}]
+
+    source = chart.attrs["data-wz-echart-zoom"]
+    series = client.post(source, json={"start": 1000, "end": 1100}).json()["series"]
+    assert series[0] == {}
+    zoomed = [x for x, _ in series[1]["data"] if 1000 <= x <= 1100]
+    assert zoomed == list(range(1000, 1101))
+
+    assert client.post("/_uiwiz/echart/unknown", json={}).status_code == 404
+
+
+def test_echart_zoom_source_evicted(setup_app, monkeypatch):
+    monkeypatch.setattr(chart_sources, "maxsize", 1)
+
+    @setup_app.page("/")
+    def index():
+        ui.echart({"series": [{"type": "line", "data": list(range(1000))}]}, max_points=100)
+
+    client = TestClient(setup_app)
+    sources = []
+    for _ in range(2):
+        chart = BeautifulSoup(client.get("/").text, "html.parser").select_one("[data-wz-echart-options]")
+        sources.append(chart.attrs["data-wz-echart-zoom"])
+
+    response = client.post(sources[0], json={})
+    assert response.status_code == 404
+    assert "no longer available" in response.json()["detail"]
+    assert chart_sources.size == _source_size(chart_sources.get(sources[1].rsplit("/", 1)[1]))
+    assert len(client.post(sources[1], json={}).json()["series"][0]["data"]) == 100
+
+
+def test_echart_append_and_stream(setup_app):
+    @setup_app.page("/")
+    def index():
+        ui.echart({"series": [{"name": "CPU", "type": "line", "data": []}]}, stream="/cpu/stream")
+
+    @setup_app.post("/cpu")
+    def cpu():
+        return ui.echart.append({"CPU": [[1, 10.5]]}, window=60)
+
+    @setup_app.get("/cpu/stream")
+    async def cpu_stream():
+        async def updates():
+            for i in range(2):
+                yield {"CPU": [[i, i * 2]]}
+
+        return ui.echart.stream(updates())
+
+    client = TestClient(setup_app)
+    chart = BeautifulSoup(client.get("/").text, "html.parser").select_one("[data-wz-echart-options]")
+    assert chart.attrs["data-wz-echart-stream"] == "/cpu/stream"
+
+    response = client.post("/cpu")
+    assert response.json() == {"append": {"CPU": [[1, 10.5]]}, "window": 60}
+
+    response = client.get("/cpu/stream")
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text == (
+        'data: {"append":{"CPU":[[0,0]]},"window":null}\n\n'
+        'data: {"append":{"CPU":[[1,2]]},"window":null}\n\n'
+        "event: close\ndata: \n\n"
+    )
+
+
+def test_echart_stream_heartbeat():
+    async def updates():
+        await asyncio.sleep(1)
+        yield {"CPU": [[0, 0]]}
+
+    async def first_message() -> bytes:
+        body = ui.echart.stream(updates(), heartbeat=0.01).body_iterator
+        message = await anext(body)
+        await body.aclose()
+        return message
+
+    assert asyncio.run(first_message()) == HEARTBEAT
+
+
+def test_echart_response_keeps_options_out_of_headers():
+    response = ui.echart.response({"series": [{"name": "Sales", "data": list(range(10_000))}]})
+    assert response.headers["hx-trigger"] == "uiwizUpdateEChart"
@@ -1,8 +1,10 @@
 from bs4 import BeautifulSoup
 import polars as pl
+from fastapi.testclient import TestClient
 from pydantic import BaseModel
 
 from uiwiz import ui
+from uiwiz.elements.table import table_sources
 
 
 class TableData(BaseModel):
@@ -83,3 +85,67 @@ def test_table_from_dataframe_polars():
     assert soup.select("th")[0].contents[0] == "input"
     assert soup.select("td")[0].contents[0] == "data"
     assert soup.select("td")[1].contents[0] == "None"
+
+
+def test_table_paginated(setup_app):
+    app = setup_app
+    rows = [TableData(input=f"row {i}") for i in range(25)]
+
+    @app.page("/")
+    def index():
+        ui.table(rows, page_size=10)
+
+    @app.page("/source")
+    def from_source():
+        ui.table(lambda offset, limit: rows[offset : offset + limit], page_size=20)
+
+    client = TestClient(app)
+    soup = BeautifulSoup(client.get("/").text, "html.parser")
+    assert [td.text for td in soup.select("td")[:10]] == [f"row {i}" for i in range(10)]
+    loader = soup.select("tr[hx-trigger=revealed]")[0]
+    assert loader.select("td")[0].attrs["colspan"] == "1"
+
+    pages = 0
+    while loader is not None:
+        pages += 1
+        headers = {"hx-target": loader.attrs["id"], "hx-swap": "outerHTML"}
+        soup = BeautifulSoup(client.post(loader.attrs["hx-post"], headers=headers).text, "html.parser")
+        loader = soup.select_one("tr[hx-trigger=revealed]")
+    assert pages == 2
+    assert soup.select("td")[-1].text == "row 24"
+
+    soup = BeautifulSoup(client.get("/source").text, "html.parser")
+    assert len(soup.select("td")) == 21
+    next_page = soup.select("tr[hx-trigger=revealed]")[0].attrs["hx-post"]
+    assert next_page.endswith("/20")
+    assert len(BeautifulSoup(client.post(next_page).text, "html.parser").select("td")) == 5
+
+
+def test_table_page_of_unknown_source(setup_app):
+    app = setup_app
+    rows = [TableData(input=f"row {i}") for i in range(25)]
+
+    @app.page("/")
+    def index():
+        ui.table(rows, page_size=10)
+
+    client = TestClient(app)
+    next_page = BeautifulSoup(client.get("/").text, "html.parser").select("tr[hx-trigger=revealed]")[0].attrs["hx-post"]
+    table_sources.invalidate()
+
+    response = client.post(next_page)
+    assert response.status_code == 200
+    soup = BeautifulSoup(response.text, "html.parser")
+    assert soup.select("tr") == []
+    assert soup.select_one("#toast").attrs["hx-swap-oob"] == "afterbegin"
+    assert "no longer available" in soup.text
+
+
+def test_table_from_dataframe_escapes_cells():
+    df = pl.DataFrame({"text": ["<b>&'\"", None], "flag": [True, None], "items": [[1, 2], None]})
+    soup = BeautifulSoup(str(ui.table.from_dataframe(df)), "html.parser")
+
+    assert [td.text for td in soup.select("td")] == ["<b>&'\"", "True", "[1, 2]", "None", "None", "None"]
+    assert len(soup.select("tbody tr")) == 2
+    assert "&lt;b&gt;&amp;&#x27;&quot;" in str(ui.table.from_dataframe(df))
+    assert "<tr>" not in str(ui.table.from_dataframe(df.clear()))
@@ -0,0 +1,64 @@
+from fastapi.staticfiles import StaticFiles
+from fastapi.testclient import TestClient
+
+from uiwiz import UiwizApp
+from uiwiz.element import Element
+from uiwiz.version import __version__
+
+
+def test_extension_is_served_from_cache_with_etag(tmp_path):
+    script = tmp_path / "cached.js"
+    script.write_text("console.log('cached')")
+
+    class Cached(Element, extensions=[script]):
+        pass
+
+    script.write_text("changed on disk")
+    client = TestClient(UiwizApp())
+    url = f"/_static/extension/{__version__}/Cached/cached.js"
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.text == "console.log('cached')"
+    assert "javascript" in response.headers["content-type"]
+    assert "immutable" in response.headers["cache-control"]
+    etag = response.headers["etag"]
+
+    not_modified = client.get(url, headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+    assert client.get(url, headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_unknown_extension_returns_404():
+    client = TestClient(UiwizApp())
+    assert client.get(f"/_static/extension/{__version__}/Missing/missing.js").status_code == 404
+
+
+def test_cache_policies_by_path_prefix(tmp_path):
+    (tmp_path / "file.txt").write_text("text")
+    app = UiwizApp(cache_age=60)
+    app.add_static_files("/assets", tmp_path)
+
+    @app.page("/")
+    def index():
+        pass
+
+    client = TestClient(app)
+    assert client.get(f"/_static/{__version__}/app.css").headers["cache-control"] == (
+        "public, max-age=31536000, immutable"
+    )
+    assert client.get("/assets/file.txt").headers["cache-control"] == "max-age=60"
+    assert "cache-control" not in client.get("/assets/missing.txt").headers
+    assert "cache-control" not in client.get("/").headers
+
+    # Folders added after the first request, or mounted directly, are still cached
+    app.add_static_files("/late", tmp_path)
+    app.mount("/my-static/", StaticFiles(directory=tmp_path))
+    assert client.get("/late/file.txt").headers["cache-control"] == "max-age=60"
+    assert client.get("/my-static/file.txt").headers["cache-control"] == "max-age=60"
+
+    app.cache_policies["/late/"] = "no-cache"
+    assert client.get("/late/file.txt").headers["cache-control"] == "no-cache"
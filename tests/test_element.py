@@ -1,6 +1,7 @@
 from unittest import mock
 
 from uiwiz import ui
+from uiwiz.element import FLUSH
 from uiwiz.frame import Frame
 
 
@@ -130,3 +131,43 @@ def test_none_html_escape():
     el = ui.element()
     el.attributes["value"] = None
     assert str(el) == '<div id="a-0" value="None"></div>'
+
+
+def test_render_iter_matches_render():
+    with ui.element() as root:
+        ui.element("img")
+        with ui.element("head"):
+            ui.element(content="<b>")
+        ui.element(render_html=False)
+    root.script = 'console.log("test")'
+
+    chunks = [chunk for chunk in root.render_iter() if chunk is not FLUSH]
+    Frame.get_stack().scripts.clear()
+    assert "".join(chunks) == root.render()
+
+
+def test_render_attribute_with_braces():
+    el = ui.element()
+    el.attributes["data-{key}"] = '{"json": {}}'
+    el.attributes["hx-vals"] = lambda: "{}"
+    assert str(el) == '<div id="a-0" data-{key}="{&quot;json&quot;: {}}" hx-vals="{}"></div>'
+
+
+def test_element_lazy_event_and_children():
+    el = ui.element()
+    assert el._event is None
+    assert el._children is None
+    assert str(el) == '<div id="a-0"></div>'
+
+    with el:
+        ui.element()
+    assert len(el.children) == 1
+
+
+def test_builtin_elements_have_no_instance_dict():
+    ui.element()
+    ui.button("button")
+    ui.input("input")
+    ui.label("label")
+    for el in Frame.get_stack().root:
+        assert not vars(el)
@@ -0,0 +1,163 @@
+import logging
+
+from bs4 import BeautifulSoup
+from fastapi.testclient import TestClient
+
+from uiwiz import UiwizApp, ui
+from uiwiz.fragment_cache import FragmentCache
+
+
+def test_fragment_is_rendered_once():
+    cache = FragmentCache()
+    calls = []
+
+    @ui.cached_fragment(key="nav", cache=cache)
+    def nav():
+        calls.append(1)
+        with ui.element("nav"):
+            ui.label("Home")
+
+    app = UiwizApp()
+
+    @app.page("/")
+    def index():
+        with ui.element():
+            nav()
+            ui.label("page")
+
+    client = TestClient(app)
+    first = client.get("/").text
+    second = client.get("/").text
+
+    assert first == second
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert '<nav id="c' in first
+    assert first.index("Home") < first.index("page")
+
+
+def test_fragment_keeps_extensions_and_scripts():
+    cache = FragmentCache()
+
+    @ui.cached_fragment(cache=cache)
+    def chart():
+        ui.element().script = "console.log('fragment')"
+        ui.markdown("# Title")
+
+    app = UiwizApp()
+
+    @app.page("/")
+    def index():
+        chart()
+
+    client = TestClient(app)
+    client.get("/")
+    body = client.get("/").text
+
+    assert cache.hits == 1
+    assert "Markdown/markdown.css" in body
+    assert body.count("console.log('fragment')") == 1
+
+
+def test_fragment_expires_and_is_evicted():
+    cache = FragmentCache(maxsize=1)
+    calls = []
+
+    @ui.cached_fragment(ttl=0, cache=cache)
+    def expired():
+        calls.append(1)
+        ui.label("expired")
+
+    @ui.cached_fragment(cache=cache)
+    def item(name: str):
+        ui.label(name)
+
+    expired()
+    expired()
+    assert len(calls) == 2
+
+    item("a")
+    item("b")
+    assert len(cache) == 1
+    item("a")
+    assert cache.hits == 0
+
+
+def test_fragment_extensions_on_other_pages():
+    cache = FragmentCache()
+
+    @ui.cached_fragment(cache=cache)
+    def docs():
+        ui.markdown("# Docs")
+
+    app = UiwizApp()
+
+    @app.page("/a")
+    def a():
+        ui.markdown("# Page a")
+        docs()
+
+    @app.page("/b")
+    def b():
+        docs()
+
+    client = TestClient(app)
+    assert "Markdown/markdown.css" in client.get("/a").text
+    body = client.get("/b").text
+
+    assert cache.hits == 1
+    assert "Markdown/markdown.css" in body
+
+
+def test_fragment_inserted_twice_gets_unique_ids():
+    cache = FragmentCache()
+
+    @ui.cached_fragment(cache=cache)
+    def card():
+        with ui.element() as element:
+            element.script = f"document.getElementById('{element.id}')"
+            ui.label("card")
+
+    app = UiwizApp()
+
+    @app.page("/")
+    def index():
+        card()
+        card()
+
+    client = TestClient(app)
+    first = client.get("/").text
+    page = BeautifulSoup(first, "html.parser")
+    ids = [element.attrs["id"] for element in page.select("[id^=c]")]
+
+    assert len(ids) == 4
+    assert len(set(ids)) == 4
+    assert all(f"getElementById('{id}')" in first for id in ids[::2])
+    assert client.get("/").text == first
+
+
+def test_fragment_with_unhashable_arguments_is_not_cached(caplog):
+    cache = FragmentCache()
+    calls = []
+
+    @ui.cached_fragment(cache=cache)
+    def items(names: list[str]):
+        calls.append(1)
+        for name in names:
+            ui.label(name)
+
+    app = UiwizApp()
+
+    @app.page("/")
+    def index():
+        items(["a", "b"])
+
+    client = TestClient(app)
+    with caplog.at_level(logging.WARNING, logger="uiwiz"):
+        first = BeautifulSoup(client.get("/").text, "html.parser")
+        client.get("/")
+
+    assert [label.text for label in first.select("label")] == ["a", "b"]
+    assert len(calls) == 2
+    assert len(cache) == 0
+    assert caplog.text.count("can not be hashed") == 1
@@ -1,4 +1,10 @@
-from uiwiz import ui
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.testclient import TestClient
+
+from uiwiz import UiwizApp, ui
+from uiwiz.frame import Frame
 
 
 def test_frame_id_reuse():
@@ -13,3 +19,86 @@ def test_frame_id_reuse():
 
     assert "a-1" == first_ele.id
     assert "a-1" != ele.id
+
+
+def test_frame_render_stream_flushes_head():
+    with ui.element("html"):
+        with ui.element("head"):
+            ui.element("title", content="title")
+        with ui.element("body"):
+            for i in range(100):
+                ui.element(content=f"row {i}")
+
+    frame = Frame.get_stack()
+
+    async def collect() -> list[str]:
+        return [chunk async for chunk in frame.render_stream(chunk_size=512)]
+
+    chunks = asyncio.run(collect())
+
+    assert chunks[0].endswith("</head>")
+    assert len(chunks) > 2
+    assert "".join(chunks).endswith("</body></html>")
+
+
+def test_frame_released_when_handler_raises():
+    app = UiwizApp()
+
+    @app.page("/raise")
+    def raise_page():
+        ui.element(content="never rendered")
+        raise ValueError
+
+    @app.ui("/ok")
+    def ok():
+        ui.element(content="ok")
+
+    client = TestClient(app, raise_server_exceptions=False)
+    live_frames = Frame.live_frames()
+
+    assert client.get("/raise").status_code == 500
+    assert client.post("/ok").status_code == 200
+    assert Frame.live_frames() == live_frames
+
+
+def test_frame_id_partial_swap():
+    from uiwiz.frame import get_request
+
+    get_request().headers = {"hx-target": "a-1", "hx-swap": "innerHTML"}
+
+    ids = [ui.element().id for _ in range(3)]
+    get_request().headers = {}
+    ids.append(ui.element().id)
+
+    prefix = ids[0].rsplit("-", 1)[0]
+    assert prefix != "a"
+    assert ids == [f"{prefix}-{i}" for i in range(4)]
+
+
+def test_frame_released_for_sync_routes():
+    app = UiwizApp()
+
+    @app.get("/plain")
+    def plain() -> str:
+        # Sync endpoints run in the threadpool, in a copy of the request context
+        return ui.label("plain").render()
+
+    client = TestClient(app)
+    live_frames = Frame.live_frames()
+
+    for _ in range(3):
+        assert client.get("/plain").status_code == 200
+    assert Frame.live_frames() == live_frames
+
+
+def test_live_frames_counted_across_threads():
+    before = Frame.live_frames()
+
+    def create_and_release(_):
+        for _ in range(200):
+            Frame().release()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(create_and_release, range(8)))
+
+    assert Frame.live_frames() == before
@@ -1,7 +1,11 @@
+import asyncio
+import zlib
+
 from fastapi.testclient import TestClient
 
-from uiwiz import ui
+from uiwiz import Element, ui
 from uiwiz.app import UiwizApp
+from uiwiz.page_definition import Page, PageDefinition
 from uiwiz.page_route import PageRouter
 from uiwiz.shared import fetch_route
 
@@ -162,3 +166,130 @@ def test_router_ui_extensions():
     assert response.status_code == 200
     assert "Markdown/markdown.css" not in body
     assert "Markdown/codehighlight.css" not in body
+
+
+def test_page_stream_matches_html_response():
+    app = UiwizApp()
+
+    def content():
+        with ui.element():
+            for i in range(50):
+                ui.label(f"label {i}")
+
+    @app.page("/html")
+    def html_page():
+        content()
+
+    @app.page("/stream", stream=True)
+    def stream_page():
+        content()
+
+    client = TestClient(app)
+    html_body = client.get("/html").text
+    response = client.get("/stream")
+
+    assert response.headers["content-type"].startswith("text/html")
+    assert response.text == html_body
+
+
+def test_page_stream_flushes_head_with_gzip():
+    app = UiwizApp()
+
+    @app.page("/stream", stream=True)
+    def stream_page():
+        with ui.element():
+            for i in range(2000):
+                ui.label(f"label {i}")
+
+    messages = []
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        # The client stays connected until the response is complete
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/stream",
+        "raw_path": b"/stream",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"testserver"), (b"accept-encoding", b"gzip")],
+        "scheme": "http",
+        "server": ("testserver", 80),
+        "client": ("testclient", 50000),
+    }
+    asyncio.run(app(scope, receive, send))
+
+    assert (b"content-encoding", b"gzip") in messages[0]["headers"]
+    chunks = [message["body"] for message in messages[1:] if message["body"]]
+    assert len(chunks) > 1
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    assert b"</head>" in decompressor.decompress(chunks[0])
+    html = decompressor.decompress(b"".join(chunks[1:]))
+    assert b"label 1999" in html
+
+
+def test_page_definition_hooks_and_title():
+    class CustomPage(PageDefinition):
+        def header(self, header: Element) -> None:
+            Element("link", href="/custom.css", rel="stylesheet")
+
+        def body(self, body: Element) -> None:
+            Element("nav", content="navigation")
+
+        def footer(self, content: Element) -> None:
+            Element("footer", content="footer")
+
+    app = UiwizApp(page_definition_class=CustomPage, toast_delay=100)
+
+    @app.page("/")
+    def index(page: Page):
+        page.title = "<Custom>"
+        ui.label("page body")
+
+    body = TestClient(app).get("/").text
+    assert body.startswith("<!DOCTYPE html><html")
+    assert '<link href="/custom.css" rel="stylesheet" id="a-' in body
+    assert body.index("/custom.css") < body.index("</head>")
+    assert body.index("navigation") < body.index("page body") < body.index("<footer")
+    assert "<title>&lt;Custom&gt;</title>" in body
+    assert "{&quot;delay&quot;:100}" in body
+
+
+def test_page_etag_not_modified():
+    app = UiwizApp()
+    content = {"text": "first"}
+
+    @app.page("/", etag=True)
+    def index():
+        ui.label(content["text"])
+
+    client = TestClient(app)
+    response = client.get("/")
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == "no-cache"
+
+    not_modified = client.get("/", headers={"if-none-match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+    assert not_modified.content == b""
+
+    # htmx would swap the empty body of a 304, boosted requests get the page. The
+    # random id prefix of the swap is left out of the etag
+    swap = {"hx-request": "true", "hx-target": "target", "hx-swap": "outerHTML"}
+    boosted = client.get("/", headers={**swap, "if-none-match": etag})
+    assert boosted.status_code == 200
+    assert boosted.headers["etag"] == etag
+
+    content["text"] = "second"
+    changed = client.get("/", headers={"if-none-match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert "second" in changed.text
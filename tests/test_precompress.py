@@ -0,0 +1,50 @@
+import gzip
+
+from fastapi.testclient import TestClient
+
+from uiwiz import UiwizApp
+from uiwiz.precompress import main, select_encoding
+
+
+def test_select_encoding():
+    assert select_encoding(None, ("br", "gzip")) is None
+    assert select_encoding("gzip, deflate, br", ("br", "gzip")) == "br"
+    assert select_encoding("gzip, br;q=0.5", ("br", "gzip")) == "gzip"
+    assert select_encoding("gzip;q=0, identity", ("br", "gzip")) is None
+    assert select_encoding("*", ("gzip",)) == "gzip"
+
+
+def test_static_files_are_served_compressed(tmp_path):
+    css = "body { color: red; }\n" * 200
+    (tmp_path / "style.css").write_text(css)
+    app = UiwizApp()
+    app.add_static_files("/assets", tmp_path)
+    client = TestClient(app)
+
+    response = client.get("/assets/style.css", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.text == css
+
+    not_modified = client.get(
+        "/assets/style.css",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]},
+    )
+    assert not_modified.status_code == 304
+
+    identity = client.get("/assets/style.css", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    assert identity.headers["etag"] != response.headers["etag"]
+    assert identity.text == css
+
+
+def test_precompressed_file_is_preferred(tmp_path):
+    (tmp_path / "app.js").write_text("console.log('app');\n" * 100)
+    main([str(tmp_path)])
+    assert (tmp_path / "app.js.gz").exists()
+
+    (tmp_path / "app.js.gz").write_bytes(gzip.compress(b"from disk"))
+    app = UiwizApp()
+    app.add_static_files("/assets", tmp_path)
+    response = TestClient(app).get("/assets/app.js", headers={"Accept-Encoding": "gzip"})
+    assert response.text == "from disk"
@@ -0,0 +1,84 @@
+from fastapi import Response
+from fastapi.testclient import TestClient
+
+from uiwiz import UiwizApp, ui
+from uiwiz.response_cache import ResponseCache
+
+
+def test_page_is_served_from_cache():
+    cache = ResponseCache(ttl=60)
+    calls = []
+    app = UiwizApp()
+
+    @app.page("/", cache=cache)
+    def index():
+        calls.append(1)
+        ui.label("cached")
+
+    client = TestClient(app)
+    first = client.get("/")
+    second = client.get("/")
+
+    assert first.text == second.text
+    assert (first.headers["x-uiwiz-cache"], second.headers["x-uiwiz-cache"]) == ("miss", "hit")
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    client.get("/?page=2")
+    client.cookies.set("data-theme", "dark")
+    client.get("/")
+    assert len(calls) == 3
+
+
+def test_ui_is_keyed_on_body():
+    cache = ResponseCache(ttl=60)
+    calls = []
+    app = UiwizApp()
+
+    @app.ui("/search", cache=cache)
+    def search():
+        calls.append(1)
+        ui.label("result")
+
+    client = TestClient(app)
+    client.post("/search", json={"q": "a"})
+    client.post("/search", json={"q": "a"})
+    client.post("/search", json={"q": "b"})
+    assert len(calls) == 2
+
+
+def test_stale_response_is_revalidated():
+    cache = ResponseCache(ttl=0, stale_while_revalidate=60)
+    calls = []
+    app = UiwizApp()
+
+    @app.page("/", cache=cache)
+    def index():
+        calls.append(1)
+        ui.label(f"render {len(calls)}")
+
+    with TestClient(app) as client:
+        assert "render 1" in client.get("/").text
+        stale = client.get("/")
+        assert stale.headers["x-uiwiz-cache"] == "stale"
+        assert "render 1" in stale.text
+        assert "render 2" in client.get("/").text
+    assert cache.stale_hits == 2
+
+
+def test_response_setting_cookie_is_not_cached():
+    cache = ResponseCache(ttl=60)
+    calls = []
+    app = UiwizApp()
+
+    @app.page("/", cache=cache)
+    def index(response: Response):
+        calls.append(1)
+        response.set_cookie("session", "value")
+        ui.label("personal")
+
+    client = TestClient(app)
+    client.get("/")
+    client.get("/")
+    assert len(calls) == 2
+    assert len(cache) == 0
@@ -0,0 +1,93 @@
+import datetime
+import json
+from decimal import Decimal
+from enum import Enum
+from html import unescape
+from uuid import UUID
+
+import polars as pl
+import pytest
+from pydantic import BaseModel
+
+from uiwiz import serialization
+from uiwiz.serialization import dumps, dumps_attribute, dumps_bytes, set_encoder
+
+
+class Color(Enum):
+    red = "red"
+
+
+class Item(BaseModel):
+    name: str
+    created: datetime.date
+
+
+@pytest.fixture(params=["stdlib", "orjson"])
+def encoder(request):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+        set_encoder(serialization._orjson_encoder)
+    else:
+        set_encoder(serialization._stdlib_encoder)
+    yield request.param
+    set_encoder()
+
+
+def test_dumps_types(encoder):
+    data = {
+        "datetime": datetime.datetime(2024, 1, 2, 3, 4, 5),
+        "date": datetime.date(2024, 1, 2),
+        "decimal": Decimal("1.50"),
+        "whole": Decimal("2"),
+        "uuid": UUID(int=1),
+        "enum": Color.red,
+        "model": Item(name="a", created=datetime.date(2024, 1, 2)),
+        "frame": pl.DataFrame({"a": [1, None]}),
+        "series": pl.Series([1.5, 2.5]),
+        "set": {1},
+        "text": "é",
+    }
+    assert json.loads(dumps(data)) == {
+        "datetime": "2024-01-02T03:04:05",
+        "date": "2024-01-02",
+        "decimal": 1.5,
+        "whole": 2,
+        "uuid": "00000000-0000-0000-0000-000000000001",
+        "enum": "red",
+        "model": {"name": "a", "created": "2024-01-02"},
+        "frame": [{"a": 1}, {"a": None}],
+        "series": [1.5, 2.5],
+        "set": [1],
+        "text": "é",
+    }
+    assert dumps({"a": [1, 2]}) == '{"a":[1,2]}'
+    assert dumps({"a": 1}, indent=True) == '{\n  "a": 1\n}'
+    assert dumps_bytes({"text": "é"}) == '{"text":"é"}'.encode()
+
+
+def test_dumps_non_finite_floats_and_large_ints(encoder):
+    data = {
+        "nan": float("nan"),
+        "inf": [float("inf"), -float("inf")],
+        "series": pl.Series([1.5, float("nan")]),
+        "big": 2**70,
+    }
+    assert dumps(data) == '{"nan":null,"inf":[null,null],"series":[1.5,null],"big":1180591620717411303424}'
+    assert dumps({"a": float("nan")}, indent=True) == '{\n  "a": null\n}'
+    assert dumps([1.5, -(2**64)]) == "[1.5,-18446744073709551616]"
+
+
+def test_dumps_attribute(encoder):
+    data = {"html": "<a href=\"x\">'&'</a>"}
+    attribute = dumps_attribute(data)
+    assert '"' not in attribute
+    assert json.loads(unescape(attribute)) == data
+
+
+def test_set_encoder():
+    set_encoder(lambda obj, indent: b"custom")
+    try:
+        assert dumps({}) == "custom"
+    finally:
+        set_encoder()
+    assert dumps({}) == "{}"
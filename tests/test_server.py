@@ -0,0 +1,29 @@
+import logging
+
+from uiwiz import server
+from uiwiz.server._server import SourceWatcher
+
+
+def test_source_watcher_skips_environments(tmp_path):
+    (tmp_path / "app.py").write_text("")
+    for directory in ("pkg", ".venv/lib", "venv/lib", "node_modules/x", "__pycache__", "myenv/lib"):
+        (tmp_path / directory).mkdir(parents=True)
+        (tmp_path / directory / "module.py").write_text("")
+    (tmp_path / "myenv" / "pyvenv.cfg").write_text("")
+
+    watcher = SourceWatcher(tmp_path)
+
+    assert set(watcher.mtimes) == {(tmp_path / "app.py").resolve(), (tmp_path / "pkg" / "module.py").resolve()}
+
+
+def test_run_warns_about_worker_local_sources(monkeypatch, caplog):
+    runs = []
+    monkeypatch.setattr(
+        server, "Multiprocess", lambda config: type("Run", (), {"run": lambda self: runs.append(config)})()
+    )
+
+    with caplog.at_level(logging.WARNING, logger="uiwiz"):
+        server.run("main:app", reload=False, workers=2)
+
+    assert runs[0].workers == 2
+    assert "same worker" in caplog.text
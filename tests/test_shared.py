@@ -0,0 +1,99 @@
+import functools
+import hashlib
+import inspect
+
+from uiwiz.shared import (
+    SourceCache,
+    _hash_function_extended,
+    fetch_route,
+    register_path,
+    reset_resources,
+    route_exists,
+)
+
+
+def make_closure(name: str):
+    def closure(): ...  # pragma: no cover
+
+    closure.__name__ = name
+    return closure
+
+
+def test_hash_is_based_on_source_and_name():
+    func = make_closure("closure_a-1")
+    expected = hashlib.sha256((inspect.getsource(func) + func.__name__).encode("utf-8")).hexdigest()
+
+    assert _hash_function_extended(func) == expected
+
+
+def test_hash_closures():
+    assert _hash_function_extended(make_closure("a")) == _hash_function_extended(make_closure("a"))
+    assert _hash_function_extended(make_closure("a")) != _hash_function_extended(make_closure("b"))
+
+
+def test_hash_wrapped_function():
+    def first(): ...  # pragma: no cover
+
+    def second(): ...  # pragma: no cover
+
+    def wrap(func):
+        @functools.wraps(func)
+        def wrapper(): ...  # pragma: no cover
+
+        return wrapper
+
+    assert _hash_function_extended(wrap(first)) == _hash_function_extended(first)
+    assert _hash_function_extended(wrap(first)) != _hash_function_extended(wrap(second))
+
+
+def test_fetch_route_closure():
+    register_path("/closure", make_closure("closure"))
+
+    assert fetch_route(make_closure("closure")) == "/closure"
+    assert fetch_route(make_closure("other")) is None
+
+
+def test_route_exists():
+    register_path("/first", make_closure("func"))
+    assert route_exists("/first")
+
+    # Moving a function to a new path releases the old path
+    register_path("/second", make_closure("func"))
+    assert route_exists("/second")
+    assert not route_exists("/first")
+
+    reset_resources()
+    assert not route_exists("/second")
+
+
+def test_route_exists_shared_path():
+    register_path("/shared", make_closure("a"))
+    register_path("/shared", make_closure("b"))
+    register_path("/other", make_closure("a"))
+
+    assert route_exists("/shared")
+    assert route_exists("/other")
+
+
+def test_source_cache_evicts_by_count_and_size():
+    sources = SourceCache(len, maxsize=3, max_bytes=10)
+    sources.set("a", "xx")
+    sources.set("b", "xx")
+    sources.set("c", "xx")
+    assert sources.get("a") == "xx"
+
+    sources.set("d", "xx")
+    assert "b" not in sources
+    assert len(sources) == 3
+
+    sources.set("e", "xxxxxx")
+    assert [token for token in ("a", "c", "d", "e") if token in sources] == ["a", "d", "e"]
+    assert sources.size == 10
+
+    # The most recent source is kept even when it is larger than max_bytes
+    sources.set("f", "x" * 20)
+    assert len(sources) == 1
+    assert sources.get("f") == "x" * 20
+
+    sources.invalidate()
+    assert sources.size == 0
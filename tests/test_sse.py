@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+from bs4 import BeautifulSoup
+from fastapi.testclient import TestClient
+
+from uiwiz import ui
+from uiwiz.frame import Frame
+from uiwiz.sse import HEARTBEAT, format_event, stream_updates
+
+
+def test_format_event():
+    assert format_event("hello") == b"data: hello\n\n"
+    assert format_event("a\nb", event="update") == b"event: update\ndata: a\ndata: b\n\n"
+    assert format_event("") == b"data: \n\n"
+
+
+def test_stream_renders_updates(setup_app):
+    @setup_app.stream("/updates")
+    async def updates():
+        for i in range(2):
+            ui.label(f"Update {i}")
+            toast = ui.element(content="oob", oob=True)
+            toast.attributes["id"] = "toast"
+            yield
+
+    @setup_app.page("/")
+    def index():
+        ui.stream("/updates", swap="beforeend")
+
+    client = TestClient(setup_app)
+    page = BeautifulSoup(client.get("/").text, "html.parser")
+    assert page.select_one("[data-wz-stream]").attrs["data-wz-stream-swap"] == "beforeend"
+
+    response = client.get("/updates")
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["cache-control"] == "no-cache"
+    *updates, close = response.text.split("\n\n")[:-1]
+    assert close == "event: close\ndata: "
+    assert len(updates) == 2
+    ids = []
+    for i, update in enumerate(updates):
+        html = BeautifulSoup(update.removeprefix("data: "), "html.parser")
+        assert html.select_one("label").text == f"Update {i}"
+        assert html.select_one("[hx-swap-oob]").attrs["id"] == "toast"
+        ids.append(html.select_one("label").attrs["id"])
+    assert ids[0] != ids[1]
+    assert not ids[0].startswith("a-")
+
+
+def test_stream_sends_extension_assets_once(setup_app):
+    @setup_app.stream("/charts")
+    async def charts():
+        for _ in range(2):
+            ui.echart({"series": []})
+            yield
+
+    updates = TestClient(setup_app).get("/charts").text.split("\n\n")[:2]
+    first, second = (BeautifulSoup(update.removeprefix("data: "), "html.parser") for update in updates)
+
+    head = first.select_one("[hx-swap-oob]")
+    assert head.attrs["hx-swap-oob"] == "beforeend:head"
+    scripts = [script.attrs["src"] for script in head.select("script[type=module]")]
+    assert [src.rsplit("/", 1)[1] for src in scripts] == ["echart.min.js", "echart.theme.js", "echart.js"]
+    assert all(src.startswith("/_static/extension/") for src in scripts)
+    assert first.select_one("[data-wz-echart]") is not None
+
+    assert second.select_one("[hx-swap-oob]") is None
+    assert second.select_one("[data-wz-echart]") is not None
+
+
+def test_stream_closes_large_updates(setup_app):
+    @setup_app.stream("/large", max_event_size=200)
+    async def large():
+        ui.label("small")
+        yield
+        ui.label("x" * 200)
+        yield
+        ui.label("never rendered")
+        yield
+
+    response = TestClient(setup_app).get("/large")
+    assert "small" in response.text
+    assert "x" * 200 not in response.text
+    assert "never rendered" not in response.text
+    assert response.text.endswith("event: close\ndata: \n\n")
+
+
+def test_stream_heartbeat_and_cleanup():
+    frame = Frame.get_stack()
+    closed = asyncio.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(1)
+            yield
+        finally:
+            closed.set()
+
+    async def first_message() -> bytes:
+        stream = stream_updates(frame, slow(), heartbeat=0.01)
+        message = await anext(stream)
+        await stream.aclose()
+        return message
+
+    assert asyncio.run(first_message()) == HEARTBEAT
+    assert closed.is_set()
+    assert frame.released
+
+
+def test_stream_requires_async_generator(setup_app):
+    with pytest.raises(TypeError):
+
+        @setup_app.stream("/sync")
+        def sync():
+            yield